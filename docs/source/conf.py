@@ -163,6 +163,9 @@ def _ticks_ms():
 def _ticks_diff(new, old):
     return new - old
 
+def _ticks_add(ticks, delta):
+    return ticks + delta
+
 def _sleep_ms(ms):
     _time.sleep(ms / 1000.0)
 
@@ -173,6 +176,7 @@ def _sleep_us(us):
 utime.ticks_us = _ticks_us
 utime.ticks_ms = _ticks_ms
 utime.ticks_diff = _ticks_diff
+utime.ticks_add = _ticks_add
 utime.sleep_ms = _sleep_ms
 utime.sleep_us = _sleep_us
 
@@ -270,6 +274,17 @@ if not hasattr(mp, "native"):
         return func
     mp.native = native
 
+# viper decorator: no-op on CPython
+if not hasattr(mp, "viper"):
+    def viper(func):
+        return func
+    mp.viper = viper
+
+# viper pointer annotations are evaluated when CPython defines the function
+for _ptr in ("ptr", "ptr8", "ptr16", "ptr32"):
+    if not hasattr(builtins, _ptr):
+        setattr(builtins, _ptr, object)
+
 # ------------------------------
 # Fake/compat ustruct module
 # ------------------------------
@@ -83,15 +83,10 @@ def make_controller_fsm():
     dot.attr("node", shape="circle")
 
     # States
-    dot.node("S0", "State 0: \n Initialize Timing \n(for integrators)")
     dot.node("S1", "State 1: \n Run Controllers")
     dot.node("S2", "State 2: \n Stop Robot")
 
     # Transitions
-    dot.edge(
-        "S0", "S1",
-        label="Always"
-    )
     dot.edge(
         "S1", "S2",
         label="velo_set.get() == 0.0\n/"
@@ -42,15 +42,18 @@ class BTComm:
         self._buf = bytearray(24)
         # Current index into the buffer
         self._idx = 0
+        # One-byte receive buffer, so reading a character allocates nothing
+        self._rx = bytearray(1)
 
     @micropython.native
     def check(self):
         """Check for new serial data and assemble complete commands.
 
         This method is intended to be called regularly from a cooperative
-        task. It reads at most one character from the underlying serial
-        device, updates an internal line buffer, and detects when a complete
-        command line (terminated by carriage return) has been received.
+        task. It reads the characters waiting on the underlying serial
+        device into an internal line buffer, stopping early when a complete
+        command line (terminated by carriage return) has been received, so
+        any characters after it are left for the next call.
 
         Line handling rules:
 
@@ -66,19 +69,25 @@ class BTComm:
             ``False`` otherwise.
 
         """
-        if self.serial_device.any():
-            b = self.serial_device.read(1)[0]
+        serial_device = self.serial_device
+        rx = self._rx
+        buf = self._buf
+        idx = self._idx
+        while serial_device.any():
+            serial_device.readinto(rx)
+            b = rx[0]
             if b == 13:      # Carriage return -> end of command
-                self.command = self._buf[:self._idx].decode("utf-8")
+                self.command = buf[:idx].decode("utf-8")
                 self._idx = 0
                 return True
             elif b == 10:    # Line feed -> ignore
                 pass
-            elif b == 8 and self._idx:  # Backspace
-                self._idx -= 1
-            elif self._idx < len(self._buf):
-                self._buf[self._idx] = b
-                self._idx += 1
+            elif b == 8 and idx:  # Backspace
+                idx -= 1
+            elif idx < len(buf):
+                buf[idx] = b
+                idx += 1
+        self._idx = idx
         return False
 
     @micropython.native
@@ -94,7 +103,7 @@ class BTComm:
     @micropython.native
     def ship(self, packet):
         """Send a pre-built packet over the serial link.
-        
+
         .. note::
             This method will block until the packet has been
             fully transmitted (or at least until it is fully
@@ -190,6 +190,23 @@ class Encoder:
         """
         return -self.velocity_run_sum * self.velo_conv
 
+    @micropython.native
+    def sample(self, out) -> None:
+        """Update the encoder and write its position and velocity to ``out``.
+
+        This combines :meth:`update`, :meth:`get_position` and
+        :meth:`get_velocity` into one call for control loops that need all
+        three every period.
+
+        Args:
+            out: Float array (``array('f')``) of at least two entries which
+                receives the position in inches at index 0 and the velocity
+                in inches per second at index 1.
+        """
+        self.update()
+        out[0] = -self.position * self.tick_to_in
+        out[1] = -self.velocity_run_sum * self.velo_conv
+
     def zero(self) -> None:
         """Reset the encoder position and velocity history to zero.
 
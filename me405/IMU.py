@@ -50,7 +50,7 @@ class IMU:
 
     Radians / heading notes:
 
-    * Raw heading data is in 1/16th of a degree; values are converted to
+    * Raw heading data is in 1/900 rad (UNITS selects radians); values are scaled to
       radians.
     * :meth:`get_heading` uses a wrap/un-wrap scheme to provide a
       continuous heading (`psi_continuous`) across multiple revolutions.
@@ -166,9 +166,25 @@ class IMU:
         The raw heading is read once and stored as an offset so that future
         heading values are reported relative to this initial orientation.
         """
-        data = self.i2c.mem_read(2, IMU_ADDR, EUL_HEADING)
-        data = (data[1] << 8) | data[0]
-        self.head_offset = -data / 900  # radians
+        self.head_offset = -self.read_heading_raw() / 900  # radians
+
+    @micropython.viper
+    def read_heading_raw(self) -> int:
+        """Read the raw Euler heading register pair.
+
+        The two bytes are read into a preallocated buffer and combined
+        without allocating, so this can be called from a task.
+
+        Returns:
+            int: Heading in 1/900 rad, as reported by the IMU.
+
+        Raises:
+            OSError: If the I²C transfer fails.
+        """
+        buf = self._b2
+        self.i2c.mem_read(buf, IMU_ADDR, EUL_HEADING)
+        data = ptr8(buf)
+        return (data[1] << 8) | data[0]
 
     @micropython.native
     def get_heading(self) -> float:
@@ -181,13 +197,11 @@ class IMU:
         Returns:
             float: Continuous heading angle (radians).
         """
-        data = self._b2
         try:
-            self.i2c.mem_read(data, IMU_ADDR, EUL_HEADING)
+            raw = self.read_heading_raw()
         except OSError:
             return self.last_heading
 
-        raw = (data[1] << 8) | data[0]
         head = -raw / 900 - self.head_offset
 
         w = ((head + self.pi) % self.pi_2) - self.pi
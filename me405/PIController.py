@@ -25,13 +25,16 @@ class PIController:
         self.time_last = 0
 
     @micropython.native
-    def get_ctrl_sig(self, cmd: float, velocity: float, time: int) -> float:
+    def get_ctrl_sig(self, cmd: float, velocity: float, time: int,
+                     dt: float = None) -> float:
         """Compute the PI control signal at the given time.
 
         Args:
             cmd: Desired value (setpoint), e.g., target wheel speed.
             velocity: Measured value, e.g., current wheel speed.
             time: Current time in milliseconds (from ``ticks_ms()``).
+            dt: Time step in seconds. Callers running at a fixed period can
+                pass it in; if ``None``, it is measured from ``time``.
 
         Returns:
             float: The saturated control output in the range [-100, 100].
@@ -39,7 +42,8 @@ class PIController:
         error = cmd - velocity
         p_cmd = self.kp * error
 
-        dt = (time - self.time_last) / 1000
+        if dt is None:
+            dt = (time - self.time_last) / 1000
         self.time_last = time
         self.esum += error * dt
 
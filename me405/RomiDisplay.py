@@ -1,9 +1,10 @@
 from tkinter import *
 from tkinter import ttk
-import os
-import signal
 from time import sleep
 import subprocess
+import threading
+
+RAD2DEG = 57.29577951308232 #Degrees per radian; Romi sends angles in radians
 
 class RomiDisplay():
     #Tkinter display so we can see what Romi's doing in real time
@@ -26,24 +27,24 @@ class RomiDisplay():
         self.Ser_cmds = Ser_cmds
         self.go_plot = go_plot
         
-        # Assign all queues as instance variables
-        self.pos_L_queue = pos_L
-        self.velo_L_queue = velo_L
-        self.velo_R_queue = velo_R
-        self.pos_R_queue = pos_R
-        self.cmd_L_queue = cmd_L
-        self.cmd_R_queue = cmd_R
-        self.Eul_head_queue = Eul_head
-        self.offset_queue = offset
-        self.yaw_rate_queue = yaw_rate
-        self.p_pos_L_queue = p_pos_L
-        self.p_pos_R_queue = p_pos_R
-        self.X_pos_queue = X_pos
-        self.Y_pos_queue = Y_pos
-        self.p_v_R_queue = p_v_R
-        self.p_v_L_queue = p_v_L
-        self.p_head_queue = p_head
-        self.velo_set_queue = velo_set
+        # Assign all latest-value boxes as instance variables
+        self.pos_L_box = pos_L
+        self.velo_L_box = velo_L
+        self.velo_R_box = velo_R
+        self.pos_R_box = pos_R
+        self.cmd_L_box = cmd_L
+        self.cmd_R_box = cmd_R
+        self.Eul_head_box = Eul_head
+        self.offset_box = offset
+        self.yaw_rate_box = yaw_rate
+        self.p_pos_L_box = p_pos_L
+        self.p_pos_R_box = p_pos_R
+        self.X_pos_box = X_pos
+        self.Y_pos_box = Y_pos
+        self.p_v_R_box = p_v_R
+        self.p_v_L_box = p_v_L
+        self.p_head_box = p_head
+        self.velo_set_box = velo_set
 
         
         
@@ -90,6 +91,10 @@ class RomiDisplay():
         self.recording.set("Not Recording")
 
         self.record_enable = False #Controls whether setting speed and stopping will record data/plot
+        self.putty = None #PuTTY process opened after copying new code
+        self._copy_proc = None #mpremote process while new code is being copied to Romi
+        self._copy_out = None #(stdout, stderr) of mpremote once it has finished
+        self._last = {} #Last string shown in each display field, so unchanged values aren't re-set
         
         #Create various "table entries" with variables and labels
         ttk.Button(mainframe, text="Update Code", command=self.update)
@@ -101,7 +106,6 @@ class RomiDisplay():
         ttk.Label(mainframe, text="Speed").grid(column=6, row=5, sticky=W)
         ttk.Button(mainframe, text="Update", command=self.speed).grid(column=8, row=5, sticky=W)
         ttk.Button(mainframe, text="STOP", command=self.stop).grid(column=8, row=6, sticky=W)
-        ttk.Entry(mainframe, textvariable=self.SPD).grid(column=7, row=5, sticky=W)
         #Record Data
         ttk.Label(mainframe, textvariable=self.recording).grid(column=7, row=7, sticky=W)
         ttk.Button(mainframe, text="Record Data", command=self.toggle_record).grid(column=8, row=7, sticky=W)
@@ -198,60 +202,114 @@ class RomiDisplay():
 
 
     def update(self):
-        with self.serial_lock:
-                try:    
-                    os.kill(self.putty.pid, signal.SIGTERM)
-                except:
-                    pass
-                #Tell serial com threads to stop reading and writing
-                self.read_stop.set()
-                self.write_stop.set()
-                sleep(0.1)
-                #self.ser.close() #Disconnect from serial port
-                print('Copying files...')
-                command = ["mpremote", "connect", "COM9", "cp", "-r", "./src/.", ":"]
+        if self._copy_proc is not None:
+            return #A copy is already running
+        self.serial_lock.acquire() #Held until _finish_update once the copy is done
+        try:
+            #Close PuTTY (if we opened it) and wait for it to let go of the COM port
+            if self.putty is not None and self.putty.poll() is None:
+                self.putty.terminate()
                 try:
-                    result = subprocess.run(command, capture_output=True, text=True, check=True)
-                    print(result.stdout)
-                except:
-                    print('Did you forget to close PuTTY???')
-                #Reconnect to serial port
-                #try:
-                #    self.ser.open()
-                #    print(f"Connected to {self.ser.name}")
-                #    self.ser.reset_input_buffer()
-                #except:
-                #    print(f"Error opening serial port: {e}")
-                #    exit()
-                #Resume reading and writing
-                self.read_stop.clear()
-                self.write_stop.clear()
-                self.putty = subprocess.Popen([r'c:\Program Files\PuTTY\putty.exe', "-load", 'Default Settings'])
-                #Open PuTTY
+                    self.putty.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    pass
+            #Tell serial com threads to stop reading and writing
+            self.read_stop.set()
+            self.write_stop.set()
+            sleep(0.1)
+            #self.ser.close() #Disconnect from serial port
+            print('Copying files...')
+            command = ["mpremote", "connect", "COM9", "cp", "-r", "./src/.", ":"]
+            self._copy_out = None
+            self._copy_proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        except OSError:
+            print('Did you forget to close PuTTY???')
+            self._copy_proc = None
+            self._finish_update()
+            return
+        except:
+            #Don't leave the serial threads locked out
+            self._copy_proc = None
+            self._finish_update()
+            raise
+        #Read mpremote's output in a worker thread so a full pipe can't stall it,
+        #and poll for the result from the Tk loop so the window doesn't freeze
+        threading.Thread(target=self._read_copy, daemon=True).start()
+        self.root.after(100, self._poll_copy)
+
+    def _read_copy(self):
+        #Runs in a worker thread; waits for mpremote while draining its output
+        try:
+            self._copy_out = self._copy_proc.communicate()
+        except Exception as e:
+            self._copy_out = ('', str(e))
+
+    def _poll_copy(self):
+        #Check back later if mpremote is still copying
+        if self._copy_out is None:
+            self.root.after(100, self._poll_copy)
+            return
+        try:
+            stdout, stderr = self._copy_out
+            if self._copy_proc.returncode == 0:
+                print(stdout)
+            else:
+                print('Did you forget to close PuTTY???')
+        finally:
+            self._copy_proc = None
+            self._copy_out = None
+            self._finish_update()
+
+    def _finish_update(self):
+        #Reconnect to serial port
+        #try:
+        #    self.ser.open()
+        #    print(f"Connected to {self.ser.name}")
+        #    self.ser.reset_input_buffer()
+        #except:
+        #    print(f"Error opening serial port: {e}")
+        #    exit()
+        try:
+            #Resume reading and writing
+            self.read_stop.clear()
+            self.write_stop.clear()
+            #Open PuTTY
+            self.putty = subprocess.Popen([r'c:\Program Files\PuTTY\putty.exe', "-load", 'Default Settings'])
+        finally:
+            #Always let the serial threads back in, even if PuTTY failed to open
+            self.serial_lock.release()
 
     def update_display(self):
-        roundlen = 2
-        """Check each queue; if data exists, update its corresponding StringVar."""
-        if not self.pos_L_queue.empty(): self.pos_L.set(round(self.pos_L_queue.get(), roundlen))
-        if not self.velo_L_queue.empty(): self.velo_L.set(round(self.velo_L_queue.get(), roundlen))
-        if not self.velo_R_queue.empty(): self.velo_R.set(round(self.velo_R_queue.get(), roundlen))
-        if not self.pos_R_queue.empty(): self.pos_R.set(round(self.pos_R_queue.get(), roundlen))
-        if not self.cmd_L_queue.empty(): self.cmd_L.set(round(self.cmd_L_queue.get(), roundlen))
-        if not self.cmd_R_queue.empty(): self.cmd_R.set(round(self.cmd_R_queue.get(), roundlen))
-        if not self.Eul_head_queue.empty(): self.Eul_head.set(round(self.Eul_head_queue.get()*57.29746, roundlen)) #Convert rad to deg
-        if not self.yaw_rate_queue.empty(): self.yaw_rate.set(round(self.yaw_rate_queue.get()*57.29746, roundlen)) #Convert rad to deg
-        if not self.offset_queue.empty(): self.offset.set(round(self.offset_queue.get(), roundlen))
-        if not self.X_pos_queue.empty(): self.X_pos.set(round(self.X_pos_queue.get(), roundlen))
-        if not self.Y_pos_queue.empty(): self.Y_pos.set(round(self.Y_pos_queue.get(), roundlen))
-        if not self.p_v_R_queue.empty(): self.p_v_R.set(round(self.p_v_R_queue.get(), roundlen))
-        if not self.p_v_L_queue.empty(): self.p_v_L.set(round(self.p_v_L_queue.get(), roundlen))
-        if not self.p_head_queue.empty(): self.p_head.set(round(self.p_head_queue.get()*57.29746, roundlen))
-        if not self.velo_set_queue.empty(): self.velo_set.set(round(self.velo_set_queue.get(), roundlen))
-        if not self.p_pos_L_queue.empty(): self.p_pos_L.set(round(self.p_pos_L_queue.get(), roundlen))
-        if not self.p_pos_R_queue.empty(): self.p_pos_R.set(round(self.p_pos_R_queue.get(), roundlen))
+        """Show the latest value from each box in its corresponding StringVar."""
+        self._show('pos_L', self.pos_L_box.v)
+        self._show('velo_L', self.velo_L_box.v)
+        self._show('velo_R', self.velo_R_box.v)
+        self._show('pos_R', self.pos_R_box.v)
+        self._show('cmd_L', self.cmd_L_box.v)
+        self._show('cmd_R', self.cmd_R_box.v)
+        self._show('Eul_head', self.Eul_head_box.v, RAD2DEG) #Convert rad to deg
+        self._show('yaw_rate', self.yaw_rate_box.v, RAD2DEG) #Convert rad to deg
+        self._show('offset', self.offset_box.v)
+        self._show('X_pos', self.X_pos_box.v)
+        self._show('Y_pos', self.Y_pos_box.v)
+        self._show('p_v_R', self.p_v_R_box.v)
+        self._show('p_v_L', self.p_v_L_box.v)
+        self._show('p_head', self.p_head_box.v, RAD2DEG)
+        self._show('velo_set', self.velo_set_box.v)
+        self._show('p_pos_L', self.p_pos_L_box.v)
+        self._show('p_pos_R', self.p_pos_R_box.v)
 
 
         self.root.after(5, self.update_display)
+
+    def _show(self, name, value, scale=1):
+        """Show ``value*scale`` in the StringVar called ``name`` unless it's empty or already shown."""
+        if value is None:
+            return #Nothing received yet
+        text = f"{value*scale:.2f}"
+        if self._last.get(name) != text:
+            getattr(self, name).set(text)
+            self._last[name] = text
     
     def speed(self):
         if self.record_enable is True:
@@ -271,8 +329,8 @@ class RomiDisplay():
             self.recording.set('Data Logging Off')
         else:
             self.record_enable = True
-            for k in self.recorded_data.keys():
-                self.recorded_data[k] = []
+            for lst in self.recorded_data.values():
+                lst.clear() #Empty in place so the reader thread keeps the same lists
             self.recording.set('Data Logging On')
 
     def start_plotter(self):
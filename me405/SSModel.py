@@ -53,8 +53,15 @@ class SSModel:
     into the state estimate.
     """
 
-    def __init__(self):
-        """Initialize model parameters, gains, and state storage."""
+    def __init__(self, u_scale: float = 1.0):
+        """Initialize model parameters, gains, and state storage.
+
+        Args:
+            u_scale: Volts per unit of input. It is folded into the motor
+                gains here, so inputs can be given in the caller's own
+                units (e.g. duty cycle in percent) without scaling each
+                step. Inputs must not be scaled again by the caller.
+        """
         # Motor gains (rad/(V*s))
         K_l = 3.5
         K_r = 3.35
@@ -64,8 +71,8 @@ class SSModel:
 
         # Derived parameters
         self.tau_inv = 1 / tau
-        self.rkm_l = r * K_l
-        self.rkm_r = r * K_r
+        self.rkm_l = r * K_l * u_scale
+        self.rkm_r = r * K_r * u_scale
         self.w_inv = 1 / w
         self.sixth = 1 / 6
 
@@ -74,27 +81,27 @@ class SSModel:
         self.L_v = 40
         self.L_pos = 10
 
-        # Pre-allocated temporary arrays for RK4
-        self.k1 = array("f", [0.0] * numstatevars)
-        self.k2 = array("f", [0.0] * numstatevars)
-        self.k3 = array("f", [0.0] * numstatevars)
-        self.k4 = array("f", [0.0] * numstatevars)
+        # Pre-allocated temporary arrays for RK4; k_sum accumulates the
+        # weighted slopes k1 + 2*k2 + 2*k3 as they are computed
+        self.k_sum = array("f", [0.0] * numstatevars)
 
         self.xd = array("f", [0.0] * numstatevars)
         self.x_last = array("f", [0.0] * numstatevars)
         self.x_tmp = array("f", [0.0] * numstatevars)
-        self.x_out = array("f", [0.0] * numstatevars)
         self.y_hat = array("f", [0.0] * numstatevars)
 
     @micropython.native
-    def x_dot_fcn(self, u, x, y):
+    def x_dot_fcn(self, u, x, y, _sin=sin, _cos=cos):
         '''Compute the time derivative of the state vector.
             Called internally by the RK4 integrator.
 
         Args:
-            u: Input vector (e.g. motor voltages) of length 2.
+            u: Input vector (motor voltages, in units of ``u_scale``) of
+                length 2.
             x: Current state vector of length 7.
             y: Measurement vector of length 5.
+            _sin, _cos: Math functions bound as defaults so they are loaded
+                as locals instead of module globals. Do not pass these.
 
         Side Effects:
             Updates :attr:`xd` with the computed state derivatives.
@@ -112,8 +119,8 @@ class SSModel:
         xd[Psi] = self.w_inv * (x[v_R] - x[v_L]) + self.L_Psi * (y[0] - x[Psi])
         xd[s_L] = x[v_L] + self.L_pos * (y[3] - x[s_L])
         xd[s_R] = x[v_R] + self.L_pos * (y[4] - x[s_R])
-        xd[X_r] = 0.5 * (x[v_L] + x[v_R]) * cos(x[Psi])
-        xd[Y_r] = 0.5 * (x[v_L] + x[v_R]) * sin(x[Psi])
+        xd[X_r] = 0.5 * (x[v_L] + x[v_R]) * _cos(x[Psi])
+        xd[Y_r] = 0.5 * (x[v_L] + x[v_R]) * _sin(x[Psi])
 
     @micropython.native
     def y_hat_fcn(self):
@@ -125,7 +132,9 @@ class SSModel:
             state vector.
 
         Returns:
-            array('f'): Estimated state/output vector.
+            array('f'): Estimated state/output vector. This is the model's
+            own buffer, updated in place by every :meth:`RK4_step`, so
+            callers may keep it rather than calling this method each step.
         """
         return self.x_last
 
@@ -142,40 +151,32 @@ class SSModel:
         x_last = self.x_last
         xd = self.xd
         x_tmp = self.x_tmp
-        x_out = self.x_out
-        k1 = self.k1
-        k2 = self.k2
-        k3 = self.k3
-        k4 = self.k4
+        k_sum = self.k_sum
+        half_dt = 0.5 * delta_t
+        sixth_dt = self.sixth * delta_t
+
+        # Each slope is folded into k_sum and the next trial state as soon
+        # as it is computed, so no slope needs its own copy
 
         # k1
         x_dot_fcn(u, x_last, y)
-        k1[:] = xd
+        for i in range(numstatevars):
+            k_sum[i] = xd[i]
+            x_tmp[i] = x_last[i] + half_dt * xd[i]
 
         # k2
-        for i in range(numstatevars):
-            x_tmp[i] = x_last[i] + 0.5 * k1[i] * delta_t
         x_dot_fcn(u, x_tmp, y)
-        k2[:] = xd
+        for i in range(numstatevars):
+            k_sum[i] += 2 * xd[i]
+            x_tmp[i] = x_last[i] + half_dt * xd[i]
 
         # k3
-        for i in range(numstatevars):
-            x_tmp[i] = x_last[i] + 0.5 * k2[i] * delta_t
         x_dot_fcn(u, x_tmp, y)
-        k3[:] = xd
-
-        # k4
         for i in range(numstatevars):
-            x_tmp[i] = x_last[i] + k3[i] * delta_t
-        x_dot_fcn(u, x_tmp, y)
-        k4[:] = xd
+            k_sum[i] += 2 * xd[i]
+            x_tmp[i] = x_last[i] + delta_t * xd[i]
 
-        # Combine increments
-        sixth = self.sixth
+        # k4, then combine increments into the saved state
+        x_dot_fcn(u, x_tmp, y)
         for i in range(numstatevars):
-            x_out[i] = x_last[i] + sixth * (
-                k1[i] + 2 * k2[i] + 2 * k3[i] + k4[i]
-            ) * delta_t
-
-        # Save for next step
-        x_last[:] = x_out
+            x_last[i] += sixth_dt * (k_sum[i] + xd[i])
@@ -29,6 +29,13 @@ class CommError(Exception):
         self.message = message
         super().__init__(self.message)
 
+class Latest:
+    #Single-slot box holding the newest value for the live display.
+    #Assigning v is atomic in CPython, so no lock is needed and old values are simply dropped.
+    __slots__ = ('v',)
+    def __init__(self):
+        self.v = None
+
 def SerialReader(ser, record_data, recorded_data, time_L, time_R, pos_L, velo_L, velo_R, pos_R, cmd_L, cmd_R, Eul_head, yaw_rate, offset, X_pos, Y_pos, p_v_R, p_v_L, p_head, velo_set, p_pos_L, p_pos_R):
 #Serial Reader Thread! 
 #Constantly receives and decodes serial data
@@ -68,25 +75,25 @@ def SerialReader(ser, record_data, recorded_data, time_L, time_R, pos_L, velo_L,
                 if buffer[idx+2] == 0x00: #normal pack of data
                     packet = buffer[idx+3:idx+packet_length] #Grab useful data (ignoring sync and type bits)
                     data = struct.unpack(format, packet)
-                    time_L.put(data[0])
-                    time_R.put(data[1])
-                    pos_L.put(data[2])
-                    velo_L.put(data[3])
-                    velo_R.put(data[4])
-                    pos_R.put(data[5])
-                    cmd_L.put(data[6])
-                    cmd_R.put(data[7])
-                    Eul_head.put(data[8])
-                    yaw_rate.put(data[9])
-                    offset.put(data[10])
-                    X_pos.put(data[11])
-                    Y_pos.put(data[12])
-                    p_v_R.put(data[13])
-                    p_v_L.put(data[14])
-                    p_head.put(data[15])
-                    velo_set.put(data[16])
-                    p_pos_L.put(data[17])
-                    p_pos_R.put(data[18])
+                    time_L.v = data[0]
+                    time_R.v = data[1]
+                    pos_L.v = data[2]
+                    velo_L.v = data[3]
+                    velo_R.v = data[4]
+                    pos_R.v = data[5]
+                    cmd_L.v = data[6]
+                    cmd_R.v = data[7]
+                    Eul_head.v = data[8]
+                    yaw_rate.v = data[9]
+                    offset.v = data[10]
+                    X_pos.v = data[11]
+                    Y_pos.v = data[12]
+                    p_v_R.v = data[13]
+                    p_v_L.v = data[14]
+                    p_head.v = data[15]
+                    velo_set.v = data[16]
+                    p_pos_L.v = data[17]
+                    p_pos_R.v = data[18]
                     if record_data.is_set():
                         recorded_data["time_L"].append(data[0])
                         recorded_data["time_R"].append(data[1])
@@ -157,26 +164,26 @@ recorded_data = {
     "p_pos_R": []
 }
 
-#Setup queues for multi-threading
-time_L = Queue()
-time_R = Queue()
-pos_L = Queue()
-velo_L = Queue()
-velo_R = Queue()
-pos_R = Queue()
-cmd_L = Queue()
-cmd_R = Queue()
-Eul_head = Queue()
-yaw_rate = Queue()
-offset = Queue()
-X_pos = Queue()
-Y_pos = Queue()
-p_v_R = Queue()
-p_v_L = Queue()
-p_head = Queue()
-velo_set = Queue()
-p_pos_L = Queue()
-p_pos_R = Queue()
+#Setup latest-value boxes for the live display
+time_L = Latest()
+time_R = Latest()
+pos_L = Latest()
+velo_L = Latest()
+velo_R = Latest()
+pos_R = Latest()
+cmd_L = Latest()
+cmd_R = Latest()
+Eul_head = Latest()
+yaw_rate = Latest()
+offset = Latest()
+X_pos = Latest()
+Y_pos = Latest()
+p_v_R = Latest()
+p_v_L = Latest()
+p_head = Latest()
+velo_set = Latest()
+p_pos_L = Latest()
+p_pos_R = Latest()
 Ser_cmds = Queue()
 
 
@@ -170,14 +170,21 @@ class ThePursuer:
 
         self.num_wp = len(self.x_coords) - 1
         self.idx = 0
+        # Per-segment values for the current waypoint, refreshed when idx advances
+        self._bs = self.base_speed[0]
+        self._bd = self.brake_dist[0]
+        self._kh = self.kp_head[0]
         self.success_dist = success_dist
+        # Squared, so waypoint arrival can be checked without a sqrt
+        self.success_dist2 = success_dist * success_dist
         self.current_speed = base_speed
         self.countdown = 0
         # A PI controller could be used here for heading, but currently only P is used
         # self.ctrller = PIController(kp, ki)
 
     @micropython.native
-    def get_offset(self, C_x, C_y, Psi, NextPoint):
+    def get_offset(self, C_x, C_y, Psi, NextPoint,
+                   _sin=sin, _cos=cos, _sqrt=sqrt, _atan2=atan2):
         """Compute wheel speed offset and forward speed.
 
         Args:
@@ -186,6 +193,9 @@ class ThePursuer:
             Psi: Current heading angle (radians).
             NextPoint: If ``True``, force advancing to the next waypoint
                 (for example, when a wall is detected).
+            _sin, _cos, _sqrt, _atan2: Math functions bound as defaults so
+                they are loaded as locals instead of module globals. Do not
+                pass these.
         
         Returns:
             tuple[float, float]: ``(offset, speed)`` where
@@ -196,42 +206,54 @@ class ThePursuer:
         """
         Psi = -Psi  # Coordinate system adjustment
 
+        # Cache attributes as locals; native code loads these much faster
+        idx = self.idx
+        x_coords = self.x_coords
+        y_coords = self.y_coords
+
         # Current target waypoint
-        P_x = self.x_coords[self.idx]
-        P_y = self.y_coords[self.idx]
+        P_x = x_coords[idx]
+        P_y = y_coords[idx]
 
-        # Error vector and distance to waypoint
+        # Error vector and squared distance to waypoint
         E_x = P_x - C_x
         E_y = P_y - C_y
-        E = sqrt(E_x ** 2 + E_y ** 2)
+        E2 = E_x * E_x + E_y * E_y
 
         # Check if waypoint reached or forced to advance
-        if E < self.success_dist or NextPoint:
-            self.idx += 1
-            if self.idx > self.num_wp:
+        if E2 < self.success_dist2 or NextPoint:
+            idx += 1
+            self.idx = idx
+            if idx > self.num_wp:
                 # No more waypoints; signal “done” via KeyboardInterrupt
                 raise KeyboardInterrupt
-            P_x = self.x_coords[self.idx]
-            P_y = self.y_coords[self.idx]
+            P_x = x_coords[idx]
+            P_y = y_coords[idx]
+            self._bs = self.base_speed[idx]
+            self._bd = self.brake_dist[idx]
+            self._kh = self.kp_head[idx]
             E_x = P_x - C_x
             E_y = P_y - C_y
-            E = sqrt(E_x ** 2 + E_y ** 2)
+            E2 = E_x * E_x + E_y * E_y
+
+        # Distance to the waypoint, needed for the speed schedule
+        E = _sqrt(E2)
 
         # Heading error alpha between robot heading and error vector
-        cpsi = cos(Psi)
-        spsi = sin(Psi)
-        alpha = atan2(cpsi * E_y - spsi * E_x, E_x * cpsi + E_y * spsi)
+        cpsi = _cos(Psi)
+        spsi = _sin(Psi)
+        alpha = _atan2(cpsi * E_y - spsi * E_x, E_x * cpsi + E_y * spsi)
 
         # Desired speed: base segment speed plus a distance-dependent boost
         # which decreases near the waypoint and with increasing heading error.
-        speed = self.base_speed[self.idx] + max(
+        speed = self._bs + max(
             FULLTHROTTLE
-            + (SLOWDOWN_ON_APPROACH * (E - self.brake_dist[self.idx])),
+            + (SLOWDOWN_ON_APPROACH * (E - self._bd)),
             0,
         ) / (1 + head_weight * abs(alpha))
 
         # Proportional steering offset on heading error
-        offset = self.kp_head[self.idx] * alpha
+        offset = self._kh * alpha
 
         # Slow down briefly when NextPoint is asserted
         if NextPoint:
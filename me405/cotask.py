@@ -20,8 +20,77 @@ full GPLv3 license text for details.
 """
 
 import gc                      # Memory allocation garbage collector
+from array import array        # Flat integer arrays for the task list
 import utime                   # MicroPython time library
 import micropython             # Used for @micropython.native hints
+from micropython import const
+
+# Bound once at import so hot paths skip the module attribute lookup
+_ticks_us = utime.ticks_us
+_ticks_diff = utime.ticks_diff
+_ticks_add = utime.ticks_add
+_gc_collect = gc.collect
+
+# ticks_us() wraps within a 30-bit range on MicroPython ports
+_TICKS_MASK = const(0x3FFFFFFF)
+_TICKS_HALF = const(0x20000000)
+
+# Task periods are given in milliseconds but kept in microseconds
+_MS_TO_US = const(1000)
+# Shortest time between free memory checks by managed garbage collection,
+# in microseconds; gc.mem_free() walks the whole heap, so it isn't free
+_GC_CHECK_US = const(1000)
+
+# Number of state transitions kept in each task's trace ring buffer, and
+# the length of the buffer, which holds two integers per transition
+_TRACE_CAP = const(100)
+_TRACE_LEN = const(200)
+
+# Indices of the profiling counters in Task._prof_ctr
+_RUNS = const(0)
+_RUN_SUM = const(1)
+_SLOWEST = const(2)
+_LATE_SUM = const(3)
+_LATEST = const(4)
+
+
+@micropython.viper
+def _ticks_late(now: int, next_run: int) -> int:
+    """Return ``ticks_diff(now, next_run)`` using untagged integer math.
+
+    This is the hot comparison in :meth:`Task.ready`; doing it in viper
+    avoids boxing the intermediate values and the call into ``utime``.
+
+    Args:
+        now: Current time from ``ticks_us()``.
+        next_run: Scheduled run time, also in ``ticks_us()`` units.
+
+    Returns:
+        int: Microseconds by which ``now`` is past ``next_run`` (negative if
+        the run time has not arrived yet).
+    """
+    return ((now - next_run + _TICKS_HALF) & _TICKS_MASK) - _TICKS_HALF
+
+
+# On Cortex-M ports the same difference takes three Thumb instructions:
+# subtract, then sign-extend the low 30 bits with a pair of shifts. Ports
+# built without the inline assembler reject the decorator at compile time,
+# so the source is compiled here, checked across a timer wrap, and the
+# viper version above is kept if either step fails.
+_TICKS_LATE_THUMB = """
+@micropython.asm_thumb
+def _ticks_late(r0, r1):
+    sub(r0, r0, r1)
+    lsl(r0, r0, 2)
+    asr(r0, r0, 2)
+"""
+try:
+    _thumb = {"micropython": micropython}
+    exec(_TICKS_LATE_THUMB, _thumb)
+    if _thumb["_ticks_late"](1, _TICKS_MASK) == 2:
+        _ticks_late = _thumb["_ticks_late"]
+except (SyntaxError, AttributeError, NameError):
+    pass
 
 
 class Task:
@@ -67,6 +136,13 @@ class Task:
                 cotask.task_list.pri_sched()
     """
 
+    # Fixed attribute layout; no per-instance dictionary is needed
+    __slots__ = (
+        "_run_gen", "_step", "name", "priority", "period", "_next_run",
+        "_prof", "_prof_ctr", "_due", "_released", "_prev_state", "_trace",
+        "_tr_data", "_tr_head", "_tr_count", "_prev_time", "go_flag", "_run",
+    )
+
     def __init__(
         self,
         run_fun,
@@ -90,8 +166,10 @@ class Task:
                 is instead awakened by :meth:`go`.
             profile: If ``True``, enable run-time profiling of the task's
                 execution time and scheduling latency.
-            trace: If ``True``, record a list of state transitions along with
-                timing information. This slows execution and allocates memory.
+            trace: If ``True``, record recent state transitions along with
+                timing information in a fixed-size buffer. This slows
+                execution somewhat. States should be integers; any other
+                value the task yields is recorded as -1.
             shares: Optional list or tuple of share/queue objects used by
                 this task. If provided, it is passed into ``run_fun``.
         """
@@ -100,6 +178,9 @@ class Task:
             self._run_gen = run_fun(shares)
         else:
             self._run_gen = run_fun()
+        # Bound method that advances the generator one step. send(None) is
+        # equivalent to next() and is available on all MicroPython ports.
+        self._step = self._run_gen.send
 
         #: Short descriptive name for the task.
         self.name = name
@@ -109,24 +190,42 @@ class Task:
 
         #: Period between runs, in microseconds (internal representation).
         if period is not None:
-            self.period = int(period * 1000)
-            self._next_run = utime.ticks_us() + self.period
+            self.period = int(period * _MS_TO_US)
+            self._next_run = _ticks_add(_ticks_us(), self.period)
         else:
             self.period = period
             self._next_run = None
 
         # Profiling and trace configuration
         self._prof = profile
+        # Run count, total run time, slowest run, total and worst latency
+        self._prof_ctr = array("l", [0, 0, 0, 0, 0])
         self.reset_profile()
+        # Time the current timed run was due, kept until the task starts
+        self._due = 0
+        self._released = False
         self._prev_state = 0
         self._trace = trace
-        self._tr_data = []
-        self._prev_time = utime.ticks_us()
+        # Trace ring buffer of (time since last run, new state) pairs,
+        # allocated once so tracing never allocates while running
+        self._tr_data = array("i", [0] * _TRACE_LEN) if trace else None
+        self._tr_head = 0
+        self._tr_count = 0
+        self._prev_time = _ticks_us()
 
         #: Flag set to ``True`` when the task is ready to run.
         self.go_flag = False
 
-    def schedule(self) -> bool:
+        # Runs the generator one step. Profiling and tracing are fixed once
+        # the task is made, so tasks using neither get a version which
+        # doesn't test for them on every run.
+        if profile or trace:
+            self._run = self._run_full
+        else:
+            self._run = self._run_plain
+
+    @micropython.native
+    def schedule(self, now=None) -> bool:
         """Attempt to run this task once.
 
         If the task is not ready to run yet (see :meth:`ready`), this method
@@ -134,78 +233,143 @@ class Task:
         generator up to the next ``yield``, updates profiling/trace data, and
         returns ``True``.
 
+        Args:
+            now: Current time from ``ticks_us()``, passed on to
+                :meth:`ready`; read from the timer if ``None``.
+
         Returns:
             bool: ``True`` if the task ran, ``False`` otherwise.
         """
-        if self.ready():
-
-            # Reset the go flag for the next run
-            self.go_flag = False
-
-            # If profiling, save the start time
-            if self._prof:
-                stime = utime.ticks_us()
-
-            # Run the generator for one step
-            curr_state = next(self._run_gen)
-
-            # If profiling or tracing, save timing data
-            if self._prof or self._trace:
-                etime = utime.ticks_us()
-
-            # If profiling, save timing data
-            if self._prof:
-                self._runs += 1
-                runt = utime.ticks_diff(etime, stime)
-                if self._runs > 2:
-                    self._run_sum += runt
-                    if runt > self._slowest:
-                        self._slowest = runt
-
-            # If transition tracing is on, record a transition; if not, ignore
-            if self._trace:
-                try:
-                    if curr_state != self._prev_state:
-                        self._tr_data.append(
-                            (utime.ticks_diff(etime, self._prev_time),
-                             curr_state)
-                        )
-                except MemoryError:
-                    self._trace = False
-                    gc.collect()
-
-                self._prev_state = curr_state
-                self._prev_time = etime
-
+        if self.ready(now):
+            self._run()
             return True
-
         else:
             return False
 
     @micropython.native
-    def ready(self) -> bool:
+    def _run_plain(self):
+        """Run the task's generator for one step, without profiling.
+
+        Used as ``_run`` by tasks with profiling and tracing both off.
+        ``_run`` is called by :meth:`schedule` once the task is known to be
+        ready, and directly by :class:`TaskList`, which tracks readiness
+        itself.
+        """
+        self.go_flag = False
+        self._step(None)
+
+    @micropython.native
+    def _run_full(self):
+        """Run the task's generator for one step, with profiling or tracing.
+
+        Clears :attr:`go_flag` and records profiling and trace data. Used as
+        ``_run`` by tasks which have profiling or tracing turned on.
+        """
+        # Load attributes into locals once; native code reads locals fastest
+        prof = self._prof
+        trace = self._trace
+        step = self._step
+
+        # Reset the go flag for the next run
+        self.go_flag = False
+
+        # If profiling, save the start time, and the latency if this run
+        # was released by the timer
+        if prof:
+            stime = _ticks_us()
+            if self._released:
+                self._released = False
+                late = _ticks_diff(stime, self._due)
+                prof_ctr = self._prof_ctr
+                prof_ctr[_LATE_SUM] += late
+                if late > prof_ctr[_LATEST]:
+                    prof_ctr[_LATEST] = late
+
+        # Run the generator for one step
+        curr_state = step(None)
+
+        # If profiling or tracing, save timing data
+        if prof or trace:
+            etime = _ticks_us()
+
+        # If profiling, save timing data
+        if prof:
+            prof_ctr = self._prof_ctr
+            runs = prof_ctr[_RUNS] + 1
+            prof_ctr[_RUNS] = runs
+            runt = _ticks_diff(etime, stime)
+            if runs > 2:
+                prof_ctr[_RUN_SUM] += runt
+                if runt > prof_ctr[_SLOWEST]:
+                    prof_ctr[_SLOWEST] = runt
+
+        # If transition tracing is on, record a transition; if not, ignore
+        if trace:
+            prev_state = self._prev_state
+            prev_time = self._prev_time
+            if curr_state != prev_state:
+                tr_data = self._tr_data
+                head = self._tr_head
+                tr_data[head] = _ticks_diff(etime, prev_time)
+                # The buffer only holds integers; mark any other state
+                tr_data[head + 1] = (curr_state if isinstance(curr_state, int)
+                                     else -1)
+                head += 2
+                if head >= _TRACE_LEN:
+                    head = 0
+                self._tr_head = head
+                self._tr_count += 1
+
+            self._prev_state = curr_state
+            self._prev_time = etime
+
+    @micropython.native
+    def ready(self, now=None) -> bool:
         """Check whether this task is ready to run.
 
         If the task is periodic, this method checks the current time against
         the next scheduled run time and updates :attr:`go_flag` accordingly.
         If the task is not periodic, the flag is only set by :meth:`go`.
 
+        Args:
+            now: Current time from ``ticks_us()``. A scheduler checking
+                several tasks in one pass reads the timer once and passes
+                the same time to each; if ``None``, the timer is read here.
+
         Returns:
             bool: ``True`` if the task is ready to run.
         """
         # If this task uses a timer, check if it's time to run again
         if self.period is not None:
-            late = utime.ticks_diff(utime.ticks_us(), self._next_run)
+            if now is None:
+                now = _ticks_us()
+            late = _ticks_late(now, self._next_run)
             if late > 0:
                 self.go_flag = True
-                self._next_run = utime.ticks_diff(self.period,
-                                                  -self._next_run)
-
-                # If keeping a latency profile, record the data
+                period = self.period
+                due = self._next_run
+                next_run = _ticks_add(due, period)
+
+                # If the task was held up for more than a whole period, skip
+                # the runs it missed rather than running it back to back
+                behind = _ticks_late(now, next_run)
+                if behind > 0:
+                    if period > 0:
+                        next_run = _ticks_add(
+                            next_run, (behind + period - 1) // period * period)
+                    else:
+                        # A zero period runs on every pass, but the next run
+                        # must still be no earlier than now, or the scheduler
+                        # would keep releasing it without ever moving on
+                        next_run = now
+                self._next_run = next_run
+
+                # If keeping a latency profile, save the time the run was due;
+                # the latency is measured when the task actually starts, so
+                # time spent waiting behind other tasks is counted
                 if self._prof:
-                    self._late_sum += late
-                    if late > self._latest:
-                        self._latest = late
+                    self._due = due
+                    self._released = True
 
         # If the task doesn't use a timer, rely on go_flag
         return self.go_flag
@@ -213,6 +377,13 @@ class Task:
     def set_period(self, new_period):
         """Change the time period between task runs.
 
+        .. note::
+            :class:`TaskList` decides which tasks need timing when they are
+            appended. A periodic task switched to :meth:`go`-only is dropped
+            from the scheduler's timing heap the next time it comes up, but
+            a :meth:`go`-only task should not be made periodic after it has
+            been added to the list.
+
         Args:
             new_period: New period in milliseconds, or ``None`` if the task
                 should only be triggered via :meth:`go`.
@@ -220,40 +391,55 @@ class Task:
         if new_period is None:
             self.period = None
         else:
-            self.period = int(new_period) * 1000
+            self.period = int(new_period) * _MS_TO_US
 
     def reset_profile(self):
         """Reset the variables used for execution time profiling."""
-        self._runs = 0
-        self._run_sum = 0
-        self._slowest = 0
-        self._late_sum = 0
-        self._latest = 0
+        prof_ctr = self._prof_ctr
+        for i in range(len(prof_ctr)):
+            prof_ctr[i] = 0
 
     def get_trace(self) -> str:
         """Return a string containing the task's transition trace.
 
         The trace is a sequence of lines, each containing a time stamp and
-        the state value to which the task transitioned.
+        the state value to which the task transitioned. Only the most recent
+        transitions that fit in the trace buffer are kept.
 
         Returns:
             str: Multi-line description of the recorded transitions, or a
             short message if tracing was disabled.
         """
-        tr_str = "Task " + self.name + ":"
-        if self._trace:
-            tr_str += "\n"
-            last_state = 0
-            total_time = 0.0
-            for item in self._tr_data:
-                total_time += item[0] / 1_000_000.0
-                tr_str += "{: 12.6f}: {: 2d} -> {:d}\n".format(
-                    total_time, last_state, item[1]
-                )
-                last_state = item[1]
+        parts = ["Task " + self.name + ":"]
+        if not self._trace:
+            return parts[0] + " not traced"
+
+        append = parts.append
+        tr_data = self._tr_data
+        last_state = 0
+        total_time = 0.0
+        if self._tr_count > _TRACE_CAP:
+            # The buffer has wrapped; the oldest entry left only supplies
+            # the state the next transition starts from
+            idx = self._tr_head
+            last_state = tr_data[idx + 1]
+            count = _TRACE_CAP - 1
+            idx += 2
         else:
-            tr_str += " not traced"
-        return tr_str
+            idx = 0
+            count = self._tr_count
+        for _ in range(count):
+            if idx >= _TRACE_LEN:
+                idx = 0
+            state = tr_data[idx + 1]
+            total_time += tr_data[idx] / 1_000_000.0
+            append("{: 12.6f}: {: 2d} -> {:d}".format(
+                total_time, last_state, state))
+            last_state = state
+            idx += 2
+        # Every line, including the last, ends with a newline as before
+        append("")
+        return "\n".join(parts)
 
     def go(self):
         """Mark this task as ready to run.
@@ -275,80 +461,439 @@ class Task:
             rst += f"{(self.period / 1000.0): 10.1f}"
         except TypeError:
             rst += "         -"
-        rst += f"{self._runs: 8d}"
-
-        if self._prof and self._runs > 0:
-            avg_dur = (self._run_sum / self._runs) / 1000.0
-            avg_late = (self._late_sum / self._runs) / 1000.0
-            rst += f"{avg_dur: 10.3f}{(self._slowest / 1000.0): 10.3f}"
+        prof_ctr = self._prof_ctr
+        runs = prof_ctr[_RUNS]
+        rst += f"{runs: 8d}"
+
+        if self._prof and runs > 0:
+            avg_dur = (prof_ctr[_RUN_SUM] / runs) / 1000.0
+            avg_late = (prof_ctr[_LATE_SUM] / runs) / 1000.0
+            rst += f"{avg_dur: 10.3f}{(prof_ctr[_SLOWEST] / 1000.0): 10.3f}"
             if self.period is not None:
-                rst += f"{avg_late: 10.3f}{(self._latest / 1000.0): 10.3f}"
+                rst += f"{avg_late: 10.3f}{(prof_ctr[_LATEST] / 1000.0): 10.3f}"
         return rst
 
 
 class TaskList:
     """List of tasks managed by the scheduler.
 
-    The task list groups tasks by priority and provides two scheduling
+    The task list groups tasks by priority and provides these scheduling
     methods:
 
     * :meth:`rr_sched` – simple round-robin execution.
     * :meth:`pri_sched` – highest-priority-first execution.
+    * :meth:`pri_sched_batch` – repeated :meth:`pri_sched` within a time
+      budget.
+    * :meth:`edf_sched` – earliest-deadline-first execution of periodic
+      tasks, with priority breaking ties.
+
+    The ``policy`` given to the constructor picks which of
+    :meth:`pri_sched` and :meth:`edf_sched` is available as :attr:`sched`,
+    so a main loop can call ``task_list.sched()`` whichever is in use.
+
+    Once all tasks have been added, :meth:`freeze` can replace
+    :meth:`pri_sched` with a version generated for that particular set of
+    tasks.
 
     In normal use, a single global :data:`task_list` is created when this
     module is imported, and user code adds tasks to that list.
     """
 
-    def __init__(self):
-        """Create an empty task list."""
-        #: List of priority groups. Each element is of the form
-        #: ``[priority, index, task, task, ...]``.
-        self.pri_list = []
+    def __init__(self, policy: str = "pri"):
+        """Create an empty task list.
+
+        Args:
+            policy: ``"pri"`` for highest-priority-first scheduling or
+                ``"edf"`` for earliest-deadline-first; selects the method
+                used as :attr:`sched`.
+
+        Raises:
+            ValueError: If ``policy`` is not one of the above.
+        """
+        if policy not in ("pri", "edf"):
+            raise ValueError("Unknown scheduling policy: " + str(policy))
+        self._policy = policy
+        # Tasks are kept as a structure of arrays so the scheduler loop only
+        # touches flat integer arrays and one flat list of tasks.
+
+        #: Priority of each group, from highest to lowest.
+        self._pris = array("i")
+        #: Index into :attr:`_tasks` where each group starts; the extra
+        #: final entry marks the end of the last group.
+        self._starts = array("i", [0])
+        #: Index of the next task to try within each group (round robin).
+        self._cursors = array("i")
+        #: All tasks in priority order, each group stored contiguously.
+        self._tasks = []
+        #: Periodic tasks as a binary min-heap keyed on their next run time,
+        #: so the scheduler only has to look at the earliest one.
+        self._heap = []
+
+        # Scheduler-managed garbage collection; see enable_managed_gc()
+        self._gc_period = 0
+        self._gc_threshold = 0
+        self._next_gc = None
+        self._next_gc_check = 0
+
+        # Set by freeze() so later appends regenerate the scheduler
+        self._frozen = False
+
+        #: Scheduler method chosen by ``policy``; call this from the main
+        #: loop to run the next ready task.
+        self.sched = self.edf_sched if policy == "edf" else self.pri_sched
 
     def append(self, task: Task):
         """Append a task to the task list.
 
-        Tasks are stored in sub-lists grouped by priority; the outer list
-        is kept sorted from highest to lowest priority.
+        Tasks are grouped by priority, and the groups are kept sorted from
+        highest to lowest priority; the task is inserted directly at the end
+        of its group. The flat arrays used by the scheduler are rebuilt
+        after each append, which only happens during setup.
+        Periodic tasks are also added to the run-time heap.
 
         Args:
             task: :class:`Task` instance to append.
         """
+        pris = list(self._pris)
+        starts = list(self._starts)
+        self._insert(task, pris, starts)
+        self._set_groups(pris, starts)
+
+        if self._frozen:
+            self.freeze()
+
+    def extend(self, tasks):
+        """Append several tasks to the task list at once.
+
+        The result is the same as calling :meth:`append` for each task in
+        turn, but the flat scheduler arrays (and the frozen scheduler, if
+        any) are only rebuilt once, after the last task is in place.
+
+        Args:
+            tasks: Iterable of :class:`Task` instances, in the order they
+                would have been appended.
+        """
+        pris = list(self._pris)
+        starts = list(self._starts)
+        for task in tasks:
+            self._insert(task, pris, starts)
+        self._set_groups(pris, starts)
+
+        if self._frozen:
+            self.freeze()
+
+    def _insert(self, task: Task, pris: list, starts: list):
+        """Insert a task at the end of its priority group.
+
+        ``pris`` and ``starts`` are plain list copies of the group arrays
+        and are updated in place; :meth:`_set_groups` turns them back into
+        the arrays used by the scheduler. Periodic tasks are also added to
+        the run-time heap.
+        """
         new_pri = task.priority
-        for pri in self.pri_list:
-            if pri[0] == new_pri:
-                pri.append(task)
+
+        # Groups are sorted from highest to lowest priority, so walk down to
+        # where this priority belongs and add an empty group if it's new
+        g = 0
+        while g < len(pris) and pris[g] > new_pri:
+            g += 1
+        if g == len(pris) or pris[g] != new_pri:
+            pris.insert(g, new_pri)
+            starts.insert(g, starts[g])
+
+        # Put the task at the end of its group and shift the later groups
+        self._tasks.insert(starts[g + 1], task)
+        for k in range(g + 1, len(starts)):
+            starts[k] += 1
+
+        if task.period is not None:
+            self._heap.append(task)
+            self._sift_up(len(self._heap) - 1)
+
+    def _set_groups(self, pris: list, starts: list):
+        """Rebuild the flat group arrays used by the scheduler."""
+        self._pris = array("i", pris)
+        self._starts = array("i", starts)
+        self._cursors = array("i", starts[:-1])
+
+    @micropython.native
+    def _sift_up(self, k: int):
+        """Move heap entry ``k`` up until its parent is due no later.
+
+        Tasks due at the same time are ordered by priority, highest first.
+        """
+        heap = self._heap
+        task = heap[k]
+        while k > 0:
+            parent = (k - 1) >> 1
+            late = _ticks_late(task._next_run, heap[parent]._next_run)
+            if late > 0 or (late == 0 and
+                            task.priority <= heap[parent].priority):
+                break
+            heap[k] = heap[parent]
+            k = parent
+        heap[k] = task
+
+    @micropython.native
+    def _sift_down(self, k: int):
+        """Move heap entry ``k`` down until both children are due no sooner."""
+        heap = self._heap
+        n = len(heap)
+        task = heap[k]
+        while True:
+            child = 2 * k + 1
+            if child >= n:
+                break
+            if child + 1 < n:
+                late = _ticks_late(heap[child + 1]._next_run,
+                                   heap[child]._next_run)
+                if late < 0 or (late == 0 and heap[child + 1].priority >
+                                heap[child].priority):
+                    child += 1
+            late = _ticks_late(heap[child]._next_run, task._next_run)
+            if late > 0 or (late == 0 and
+                            heap[child].priority <= task.priority):
+                break
+            heap[k] = heap[child]
+            k = child
+        heap[k] = task
+
+    @micropython.native
+    def _release(self, now: int):
+        """Flag every periodic task whose run time has arrived by ``now``.
+
+        The heap is ordered by next run time, so only tasks which are due
+        are ever looked at; tasks triggered only by :meth:`Task.go` are
+        never checked here at all.
+
+        Args:
+            now: Current time from ``ticks_us()``, shared by every task
+                checked in this pass.
+        """
+        heap = self._heap
+        while heap:
+            task = heap[0]
+            if task.period is None:
+                # Switched to go()-only by set_period(); no timing needed
+                self._drop_root()
+            elif _ticks_late(now, task._next_run) > 0:
+                task.ready(now)
+                self._sift_down(0)
+            else:
                 break
-        else:
-            self.pri_list.append([new_pri, 2, task])
 
-        self.pri_list.sort(key=lambda pri: pri[0], reverse=True)
+    def _drop_root(self):
+        """Remove the earliest task from the run-time heap."""
+        heap = self._heap
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
 
     @micropython.native
     def rr_sched(self):
         """Run tasks in round-robin order, ignoring priorities."""
-        for pri in self.pri_list:
-            for task in pri[2:]:
-                task.schedule()
+        self._release(_ticks_us())
+        for task in self._tasks:
+            if task.go_flag:
+                task._run()
 
     @micropython.native
     def pri_sched(self):
         """Run the highest-priority ready task.
 
-        Within each priority level, tasks are scheduled in round-robin
-        order. This method returns after the first task which actually runs.
+        Periodic tasks whose run time has arrived are first taken off the
+        top of the run-time heap and flagged ready, so an idle pass costs a
+        single time comparison rather than one per task. Then, within each
+        priority level, ready tasks are run in round-robin order. This
+        method returns after the first task which actually runs.
+
+        Returns:
+            bool: ``True`` if a task ran, ``False`` if none were ready.
         """
-        for pri in self.pri_list:
-            tries = 2
-            length = len(pri)
-            while tries < length:
-                ran = pri[pri[1]].schedule()
-                tries += 1
-                pri[1] += 1
-                if pri[1] >= length:
-                    pri[1] = 2
-                if ran:
-                    return
+        self._release(_ticks_us())
+
+        tasks = self._tasks
+        starts = self._starts
+        cursors = self._cursors
+        for g in range(len(cursors)):
+            start = starts[g]
+            end = starts[g + 1]
+            cur = cursors[g]
+            for _ in range(end - start):
+                task = tasks[cur]
+                cur += 1
+                if cur >= end:
+                    cur = start
+                if task.go_flag:
+                    task._run()
+                    cursors[g] = cur
+                    return True
+
+        # Nothing was ready, so this is a safe time to collect garbage
+        if self._gc_period:
+            self._managed_gc()
+        return False
+
+    @micropython.native
+    def _run_group(self, g: int) -> bool:
+        """Run the next ready task in group ``g`` in round-robin order.
+
+        Returns:
+            bool: ``True`` if a task ran, ``False`` if none were ready.
+        """
+        tasks = self._tasks
+        start = self._starts[g]
+        end = self._starts[g + 1]
+        cur = self._cursors[g]
+        for _ in range(end - start):
+            task = tasks[cur]
+            cur += 1
+            if cur >= end:
+                cur = start
+            if task.go_flag:
+                task._run()
+                self._cursors[g] = cur
+                return True
+        return False
+
+    def freeze(self):
+        """Replace :meth:`pri_sched` with code specialized for these tasks.
+
+        The source of a new scheduler function is written out with one
+        check per priority group, highest first, and compiled with
+        :func:`exec`. A group holding a single task is checked inline, with
+        the task itself bound as a global, so the common case needs no
+        loops, array indexing or length checks. Groups holding several
+        tasks still take turns through :meth:`_run_group`. The result
+        behaves exactly like :meth:`pri_sched` and is stored on this
+        instance, so :meth:`pri_sched_batch` picks it up as well.
+
+        Call this after all tasks have been appended. Tasks appended later
+        cause the scheduler to be generated again.
+        """
+        names = {"micropython": micropython, "tl": self,
+                 "_ticks_us": _ticks_us}
+        src = ["@micropython.native", "def pri_sched():",
+               "    tl._release(_ticks_us())"]
+        starts = self._starts
+        for g in range(len(self._pris)):
+            if starts[g + 1] - starts[g] == 1:
+                name = "t" + str(g)
+                names[name] = self._tasks[starts[g]]
+                src.append("    if " + name + ".go_flag:")
+                src.append("        " + name + "._run()")
+            else:
+                src.append("    if tl._run_group(" + str(g) + "):")
+            src.append("        return True")
+        src.append("    if tl._gc_period:")
+        src.append("        tl._managed_gc()")
+        src.append("    return False")
+
+        exec("\n".join(src), names)
+        self.pri_sched = names["pri_sched"]
+        if self._policy == "pri":
+            self.sched = self.pri_sched
+        self._frozen = True
+
+    @micropython.native
+    def edf_sched(self):
+        """Run the periodic task with the earliest deadline, if it is due.
+
+        Where :meth:`pri_sched` always favours the highest priority, this
+        method runs whichever periodic task's run time came first, so a
+        busy high-priority task can't hold off lower-priority ones
+        indefinitely. Priority only decides between tasks due at the same
+        time. When no periodic task is due, tasks woken by :meth:`Task.go`
+        are run highest priority first, as in :meth:`pri_sched`.
+
+        Returns:
+            bool: ``True`` if a task ran, ``False`` if none were ready.
+        """
+        heap = self._heap
+        while heap and heap[0].period is None:
+            # Switched to go()-only by set_period(); no timing needed
+            self._drop_root()
+        if heap:
+            task = heap[0]
+            now = _ticks_us()
+            if _ticks_late(now, task._next_run) > 0:
+                task.ready(now)
+                self._sift_down(0)
+                task._run()
+                return True
+
+        for g in range(len(self._cursors)):
+            if self._run_group(g):
+                return True
+
+        # Nothing was ready, so this is a safe time to collect garbage
+        if self._gc_period:
+            self._managed_gc()
+        return False
+
+    def enable_managed_gc(self, period_ms: int = 100,
+                          threshold_bytes: int = 4096):
+        """Let :meth:`pri_sched` run the garbage collector at idle times.
+
+        Once enabled, automatic garbage collection is turned off the first
+        time :meth:`pri_sched` finds no task ready. From then on
+        :func:`gc.collect` is only called from passes where no task is
+        ready, either every ``period_ms`` or sooner if free memory drops
+        below ``threshold_bytes``. Free memory is checked at most once per
+        millisecond, since :func:`gc.mem_free` has to walk the heap. This
+        keeps collections from landing in the middle of a task and adding
+        jitter to its timing.
+
+        .. warning::
+            With automatic collection off, an allocation that doesn't fit
+            raises :class:`MemoryError` instead of triggering a collection,
+            so ``threshold_bytes`` must leave room for the largest burst of
+            allocations the tasks make between idle passes.
+
+        Args:
+            period_ms: Longest time between collections, in milliseconds.
+            threshold_bytes: Collect early when :func:`gc.mem_free` falls
+                below this many bytes.
+        """
+        self._gc_period = int(period_ms) * _MS_TO_US
+        self._gc_threshold = threshold_bytes
+        self._next_gc = None
+
+    def _managed_gc(self):
+        """Collect garbage if the period has elapsed or memory is low."""
+        now = _ticks_us()
+        if self._next_gc is None:
+            gc.disable()
+            self._next_gc = now
+            self._next_gc_check = now
+        if _ticks_diff(now, self._next_gc) < 0:
+            # Not time for a routine collection; check free memory only if
+            # it hasn't been checked in the last millisecond
+            if _ticks_diff(now, self._next_gc_check) < 0:
+                return
+            self._next_gc_check = _ticks_add(now, _GC_CHECK_US)
+            if gc.mem_free() >= self._gc_threshold:
+                return
+        _gc_collect()
+        self._next_gc = _ticks_add(now, self._gc_period)
+
+    def pri_sched_batch(self, budget_us: int = 500):
+        """Keep running ready tasks until none are left or time runs out.
+
+        Each step is one :meth:`pri_sched` call, so after every task run the
+        search starts again from the highest priority and lower-priority
+        tasks can never get ahead of higher-priority ones. Once
+        ``budget_us`` has elapsed the method returns, even if more tasks are
+        ready, so the caller regains control regularly.
+
+        Args:
+            budget_us: Time budget for the batch in microseconds.
+        """
+        start = _ticks_us()
+        while self.pri_sched():
+            if _ticks_diff(_ticks_us(), start) >= budget_us:
+                break
 
     def __repr__(self) -> str:
         """Return diagnostic text showing all tasks in the list."""
@@ -356,9 +901,8 @@ class TaskList:
             "TASK             PRI    PERIOD    RUNS   AVG DUR   MAX "
             "DUR  AVG LATE  MAX LATE\n"
         )
-        for pri in self.pri_list:
-            for task in pri[2:]:
-                ret_str += str(task) + "\n"
+        for task in self._tasks:
+            ret_str += str(task) + "\n"
 
         return ret_str
 
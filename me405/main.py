@@ -27,7 +27,7 @@ On startup, the script performs the following steps:
   - Line following (:func:`LineFollow_fun`)
   - Pure pursuit path tracking (:func:`Pursuer_fun`)
   - State-space model simulation (:func:`SS_Simulator_fun`)
-  - Periodic garbage collection (:func:`GarbageCollector_fun`)
+  - Low-memory garbage collection (:func:`GarbageCollector_fun`)
 * Register those tasks with :mod:`cotask` and run the priority scheduler
   in a loop until a *keyboard interrupt* is received.
 
@@ -50,13 +50,11 @@ queue before exiting.
 
 import gc
 from pyb import Pin, Timer, UART, I2C
-import time
-from time import ticks_ms, ticks_diff, sleep
+from time import sleep, ticks_ms
 import cotask
 import task_share
-import ustruct
 from array import array
-from math import copysign
+import micropython
 from micropython import const
 
 # Import custom drivers and controller classes
@@ -70,11 +68,101 @@ from PIController import PIController
 from ThePursuer import ThePursuer
 
 # Tunable parameters
+MAINPERIOD = const(30) #Period (ms) of the control and estimation tasks.
+DT_S = MAINPERIOD / 1000 #The same period in seconds, used as the fixed time step.
 MAXDELTA = const(25) #Maximum change in motor duty cycle per control tick.
 ARRIVED = const(2.5) #Distance threshold (inches) used by the pure-pursuit path planner to
 #decide when a waypoint has been "arrived" at.
+BASESPEED = const(18) #Pure-pursuit base speed (in/s); unused, segments set their own.
+KP_HEAD = const(9) #Pure-pursuit heading gain; unused, segments set their own.
+KI_HEAD = const(0) #Pure-pursuit heading integral gain; unused.
+GC_PERIOD = const(1000) #Period (ms) of the safety-net garbage collection task.
+GC_LOW_WATER = const(8192) #Free heap (bytes) below which that task collects.
+MEMSTATS = False #Print heap usage and track queue high-water marks (or put a "memstats" file on the board).
+
+# Bits set in the ``frame_ready`` share by each task that feeds the telemetry
+# packet; Talker_fun ships a packet once all of them are set.
+FRAME_CTRL = const(1)
+FRAME_SS = const(2)
+FRAME_IMU = const(4)
+FRAME_ALL = const(7)
+
+# Telemetry packet: a 3-byte header, then the little-endian
+# ``"<II" + "f" * 17`` fields. TX_BATCH packets are sent per UART write.
+PACKET_LEN = const(79)
+TX_BATCH = const(2)
+
+# Returned by _parse_milli() for text it can't parse; the caller falls back
+# to float(), which handles the rarer forms such as exponents
+PARSE_ERR = const(-0x3FFFFFFF)
+
+
+@micropython.viper
+def _parse_milli(buf: ptr8, start: int, end: int) -> int:
+    """Parse a signed decimal number from bytes, in thousandths.
+
+    Reads text such as ``"-12.5"`` from ``buf[start:end]`` using integer
+    math only, so no substring or float object is created. Surrounding
+    whitespace is skipped and digits past the third decimal place are
+    ignored. Anything else, such as an exponent, is left to :func:`float`.
 
+    Args:
+        buf: Bytes of the command text.
+        start: Index of the first character of the number.
+        end: Index just past the last character.
 
+    Returns:
+        int: The value times 1000, or ``PARSE_ERR`` if the text is not a
+        plain decimal number.
+    """
+    # Skip leading and trailing spaces, tabs, and line endings
+    while start < end:
+        c = int(buf[start])
+        if c != 32 and (c < 9 or c > 13):
+            break
+        start += 1
+    while end > start:
+        c = int(buf[end - 1])
+        if c != 32 and (c < 9 or c > 13):
+            break
+        end -= 1
+
+    i = start
+    neg = False
+    if i < end and int(buf[i]) == 45:      # '-'
+        neg = True
+        i += 1
+    elif i < end and int(buf[i]) == 43:    # '+'
+        i += 1
+
+    val = 0
+    digits = 0
+    frac = -1      # Digits read after the '.', or -1 before it
+    while i < end:
+        c = int(buf[i])
+        if c == 46 and frac < 0:           # '.'
+            frac = 0
+        elif c >= 48 and c <= 57:          # '0' to '9'
+            if frac < 3:
+                val = val * 10 + (c - 48)
+                if frac >= 0:
+                    frac += 1
+            digits += 1
+        else:
+            return PARSE_ERR
+        i += 1
+    if digits == 0:
+        return PARSE_ERR
+
+    if frac < 0:
+        frac = 0
+    while frac < 3:
+        val *= 10
+        frac += 1
+    return -val if neg else val
+
+
+@micropython.native
 def Talker_fun(shares):
     """Bluetooth communication task.
 
@@ -83,30 +171,35 @@ def Talker_fun(shares):
     incoming commands and to build and ship telemetry packets.
 
     .. note::
-        Telemetry packets are sent in a structured binary format using
-        :mod:`ustruct` to minimize bandwidth usage.
+        Telemetry packets are sent in a structured binary format, a 3-byte
+        header followed by the little-endian ``"<II" + "f" * 17`` layout,
+        to minimize bandwidth usage. Each field is copied into the packet
+        directly from its queue or share with ``get_into``, so no format
+        string is parsed while running.
 
     The task operates as a small state machine:
 
     * **State 0** – Listen for incoming characters. If a complete command
-      is available, transition to state 1. Otherwise, if enough samples
-      are present in the various telemetry queues, pack them into a
-      structured binary packet and send (every other iteration) over
-      Bluetooth.
+      is available, transition to state 1. Otherwise, if every producing
+      task has published new telemetry samples, pack them into a
+      structured binary packet and send it over Bluetooth.
     * **State 1** – Interpret a fully received command. Currently
       supports a ``$SPDxx.x`` command to change the requested wheel
       speed. After processing, transitions back to state 0.
 
     .. tip::
-        Only every other packet is sent to cut down on tasks run time
-        But, all available telemetry samples are still packed into a
-        packet each time to avoid queue overflows.
+        Packets are filled back to back in ``packet`` and handed to
+        :meth:`BTComm.ship` ``TX_BATCH`` at a time, so the UART is written
+        once per batch. Each packet keeps its own header, so the PC side
+        parses them as usual.
 
     .. tip::
-        This task only checks certain queues for available samples
-        before trying to build a telemetry packet. This is because
-        several groups of queues are filled by the same task, so checking
-        every single queue is redundant.
+        Rather than checking the telemetry queues for samples, this task
+        checks the ``frame_ready`` share, in which each producing task sets
+        its own bit after publishing its data. A packet is built once all
+        of the bits are set, and the first complete set after startup is
+        skipped so every queue keeps at least one sample for other tasks
+        to :meth:`~task_share.Queue.view`.
 
     .. warning::
         Since the IMU yaw rate is currently not implemented, this task
@@ -127,8 +220,8 @@ def Talker_fun(shares):
         shares: Tuple of share/queue objects and configuration values, in
             the following order:
 
-            * ``packet`` (:class:`bytearray`): Outgoing telemetry buffer.
-            * ``packet_fmt`` (:class:`str`): ``ustruct`` format string.
+            * ``packet`` (:class:`bytearray`): Outgoing telemetry buffer,
+              ``TX_BATCH`` packets long.
             * ``btcomm`` (:class:`BTComm`): Bluetooth communications object.
             * ``velo_set`` (:class:`task_share.Share`): Requested wheel speed.
             * ``kp_lf``, ``ki_lf`` (:class:`float`): Line-follow controller gains. **DEPRACTATED**
@@ -140,7 +233,6 @@ def Talker_fun(shares):
               Commanded efforts for left and right motors.
             * ``offset`` (:class:`task_share.Share`): Line-follow/point tracking speed offset.
             * ``Eul_head`` (:class:`task_share.Queue`): Euler heading from IMU.
-            * ``yaw_rate`` (:class:`task_share.Queue`): Yaw rate from IMU. **Currently always 0**
             * ``X_pos``, ``Y_pos`` (:class:`task_share.Queue`): Estimated X/Y position.
             * ``p_v_R``, ``p_v_L`` (:class:`task_share.Queue`):
               State-space path length and velocity.
@@ -148,71 +240,82 @@ def Talker_fun(shares):
               State-space heading and yaw rate.
             * ``p_pos_L``, ``p_pos_R`` (:class:`task_share.Queue`):
               State-space - path length per wheel.
+            * ``frame_ready`` (:class:`task_share.Share`): Bit mask of the
+              producing tasks which have published new data.
 
     """
     # Unpack shares and queues
-    (packet, packet_fmt, btcomm, velo_set, kp_lf, ki_lf, time_L, pos_L,
+    (packet, btcomm, velo_set, kp_lf, ki_lf, time_L, pos_L,
      velo_L, time_R, pos_R, velo_R, cmd_L, cmd_R, offset, Eul_head,
-     yaw_rate, X_pos, Y_pos, p_v_R, p_v_L, p_head, p_yaw, p_pos_L,
-     p_pos_R) = shares
+     X_pos, Y_pos, p_v_R, p_v_L, p_head, p_yaw, p_pos_L,
+     p_pos_R, frame_ready) = shares
 
     state = 0
-    sendit = True
+    primed = False
+    # Offset of the packet being filled in the batch buffer
+    base = 0
+
+    # Methods called on every run, looked up once; the per-packet copies
+    # below only run once per frame, so they are left as they are
+    check = btcomm.check
+    get_ready = frame_ready.get
+    put_ready = frame_ready.put
 
     while True:
         if state == 0:
             # Listen for input; if a full command is ready, go interpret it
-            if btcomm.check():
+            if check():
                 state = 1
             else:
-                # Only ship data if all critical queues have enough samples
-                if (time_L.many() and
-                    time_R.many() and
-                    cmd_L.many() and
-                    Eul_head.many() and
-                        p_pos_L.many()):
-                    ustruct.pack_into(
-                        packet_fmt,
-                        packet,
-                        3,
-                        time_L.get(),
-                        time_R.get(),
-                        pos_L.get(),
-                        velo_L.get(),
-                        velo_R.get(),
-                        pos_R.get(),
-                        cmd_L.get(),
-                        cmd_R.get(),
-                        Eul_head.get(),
-                        yaw_rate.get(),
-                        offset.get(),
-                        X_pos.get(),
-                        Y_pos.get(),
-                        p_v_R.get(),
-                        p_v_L.get(),
-                        p_head.get(),
-                        velo_set.get(),
-                        p_pos_L.get(),
-                        p_pos_R.get(),
-                    )
-                    # Only send every other packet to throttle bandwidth
-                    if sendit:
-                        btcomm.ship(packet)
-                        sendit = False
+                # Only ship data once every producing task has published
+                # new samples; the first full set is left in the queues
+                if get_ready() == FRAME_ALL:
+                    put_ready(0)
+                    if primed:
+                        # Copy each sample's bytes straight into its slot in
+                        # the current packet; the board is little-endian
+                        # like the packet format
+                        time_L.get_into(packet, base + 3)
+                        time_R.get_into(packet, base + 7)
+                        pos_L.get_into(packet, base + 11)
+                        velo_L.get_into(packet, base + 15)
+                        velo_R.get_into(packet, base + 19)
+                        pos_R.get_into(packet, base + 23)
+                        cmd_L.get_into(packet, base + 27)
+                        cmd_R.get_into(packet, base + 31)
+                        Eul_head.get_into(packet, base + 35)
+                        # Bytes 39-42 (IMU yaw rate) are never written and
+                        # stay zero
+                        offset.get_into(packet, base + 43)
+                        X_pos.get_into(packet, base + 47)
+                        Y_pos.get_into(packet, base + 51)
+                        p_v_R.get_into(packet, base + 55)
+                        p_v_L.get_into(packet, base + 59)
+                        p_head.get_into(packet, base + 63)
+                        velo_set.get_into(packet, base + 67)
+                        p_pos_L.get_into(packet, base + 71)
+                        p_pos_R.get_into(packet, base + 75)
+                        base += PACKET_LEN
+                        # Send the batch once it is full
+                        if base == PACKET_LEN * TX_BATCH:
+                            btcomm.ship(packet)
+                            base = 0
                     else:
-                        sendit = True
+                        primed = True
 
         elif state == 1:
             # Interpret a fully received command string
             rawcmd = btcomm.get_command()
-            if not rawcmd:
-                pass
-            elif rawcmd[0] == "$":
-                # Example: "$SPD1.5" sets wheel speed to 1.5 in/s
-                if rawcmd[1:4] == "SPD":
+            # Example: "$SPD1.5" sets wheel speed to 1.5 in/s
+            if rawcmd.startswith("$SPD"):
+                spd = _parse_milli(rawcmd, 4, len(rawcmd))
+                if spd != PARSE_ERR:
+                    velo_set.put(spd / 1000)
+                else:
+                    # Not a plain decimal; let float() decide, as before
                     try:
                         velo_set.put(float(rawcmd[4:]))
-                    except Exception:
+                    except ValueError:
                         pass
             state = 0
 
@@ -228,25 +331,27 @@ def IMU_Interface_fun(shares):
     .. note::
         The current implementation only reads the heading angle. The initial
         itertion also read the yaw rate, but to minimize exceuption time,
-        this feature was removed. A zero value is currently published for yaw
-        rate so an empty queue doesn't block data transmission.
+        this feature was removed. The yaw rate slot of the telemetry
+        packet is left at zero.
 
     Args:
-        shares: Tuple ``(imu, Eul_head, yaw_rate, SENS_LED)`` where:
+        shares: Tuple ``(imu, Eul_head, SENS_LED, frame_ready)``
+            where:
 
             * ``imu`` (:class:`IMU`): IMU driver instance.
             * ``Eul_head`` (:class:`task_share.Queue`): Euler heading (rad).
-            * ``yaw_rate`` (:class:`task_share.Queue`): Yaw rate (rad/s).
             * ``SENS_LED`` (:class:`pyb.Pin`): Status LED (currently unused).
+            * ``frame_ready`` (:class:`task_share.Share`): Telemetry bit
+              mask; ``FRAME_IMU`` is set after each reading.
     """
-    imu, Eul_head, yaw_rate, SENS_LED = shares
+    imu, Eul_head, SENS_LED, frame_ready = shares
     while True:
         Eul_head.put(imu.get_heading())
-        # Yaw rate is currently unused, but left for future expansion
-        yaw_rate.put(0)
+        frame_ready.put(frame_ready.get() | FRAME_IMU)
         yield
 
 
+@micropython.native
 def SS_Simulator_fun(shares):
     """State-space simulation task.
 
@@ -290,10 +395,28 @@ def SS_Simulator_fun(shares):
               Estimated heading and yaw rate.
             * ``p_pos_L``, ``p_pos_R`` (:class:`task_share.Queue`):
               Estimated path length per wheel.
+            * ``frame_ready`` (:class:`task_share.Share`): Telemetry bit
+              mask; ``FRAME_SS`` is set after each step.
     """
     (RUN_LED, imu_off, ssmodel, mainperiod, y, u, Eul_head, velo_L, velo_R,
      pos_L, pos_R, cmd_L, cmd_R, X_pos, Y_pos, p_v_R, p_v_L, p_head, p_yaw,
-     p_pos_L, p_pos_R) = shares
+     p_pos_L, p_pos_R, frame_ready) = shares
+
+    # The model returns the same output array after every step, so it only
+    # needs to be looked up once
+    yhat = ssmodel.y_hat_fcn()
+
+    # Methods called on every run, looked up once
+    rk4_step = ssmodel.RK4_step
+    view_cmd_L = cmd_L.view_into
+    view_cmd_R = cmd_R.view_into
+    view_head = Eul_head.view_into
+    view_velo_L = velo_L.view_into
+    view_velo_R = velo_R.view_into
+    view_pos_L = pos_L.view_into
+    view_pos_R = pos_R.view_into
+    get_ready = frame_ready.get
+    put_ready = frame_ready.put
 
     while True:
         # Blink the run LED to show activity
@@ -303,34 +426,38 @@ def SS_Simulator_fun(shares):
         if imu_off.get() == 1:
             ssmodel.L_Psi = 0
 
-        # Build input vector from motor commands (assumes ~9V supply)
-        u[0] = 0.09 * cmd_L.view()
-        u[1] = 0.09 * cmd_R.view()
+        # Build input vector from motor commands; the model was built with
+        # the duty cycle to volts scale, so they are copied in unscaled
+        view_cmd_L(u, 0)
+        view_cmd_R(u, 4)
 
-        # Build measurement vector from latest sensor data
-        y[0] = Eul_head.view()
-        y[1] = velo_L.view()
-        y[2] = velo_R.view()
-        y[3] = pos_L.view()
-        y[4] = pos_R.view()
+        # Build measurement vector from latest sensor data, copying each
+        # float's bytes straight into its slot (4 bytes per entry)
+        view_head(y, 0)
+        view_velo_L(y, 4)
+        view_velo_R(y, 8)
+        view_pos_L(y, 12)
+        view_pos_R(y, 16)
 
         # Advance the state-space model
-        ssmodel.RK4_step(u, y, mainperiod)
-
-        # Publish estimated outputs
-        yhat = ssmodel.y_hat_fcn()
-        p_v_L.put(yhat[0])
-        p_v_R.put(yhat[1])
-        p_head.put(yhat[2])
-        p_pos_L.put(yhat[3])
-        p_pos_R.put(yhat[4])
-        X_pos.put(yhat[5])
+        rk4_step(u, y, mainperiod)
+
+        # Publish estimated outputs, copying each float straight from the
+        # output array (4 bytes per entry) into its queue
+        p_v_L.put_from(yhat, 0)
+        p_v_R.put_from(yhat, 4)
+        p_head.put_from(yhat, 8)
+        p_pos_L.put_from(yhat, 12)
+        p_pos_R.put_from(yhat, 16)
+        X_pos.put_from(yhat, 20)
         # Invert Y for convenience of the chosen coordinate frame
         Y_pos.put(-yhat[6])
         p_yaw.put(0)
+        put_ready(get_ready() | FRAME_SS)
         yield
 
 
+@micropython.native
 def LineFollow_fun(shares):
     """Line follower task.
 
@@ -365,10 +492,6 @@ def LineFollow_fun(shares):
           activity.
         * ``length`` (:class:`float`): Half-width of the sensor index
           range used in centroid computation.
-        * ``Aixi_sum`` (:class:`float`): Working variable for centroid
-          numerator (unused outside).
-        * ``Ai_sum`` (:class:`float`): Working variable for centroid
-          denominator (unused outside).
         * ``X_pos`` (:class:`task_share.Queue`): Estimated X position.
         * ``velo_set`` (:class:`task_share.Share`): Requested average speed.
         * ``lf_stop`` (:class:`task_share.Share`): Flag to disable the
@@ -379,57 +502,55 @@ def LineFollow_fun(shares):
         * ``Line_sensor`` (:class:`LineSensor`): Calibrated line sensor
           driver instance.
     """
-    (SENS_LED, length, Aixi_sum, Ai_sum, X_pos, velo_set, lf_stop, kp_lf,
-     ki_lf, offset, Line_sensor) = shares
+    (SENS_LED, length, X_pos, velo_set, lf_stop, kp_lf, ki_lf, offset,
+     Line_sensor) = shares
 
     state = 0
     esum = 0
-    time_last = 0
+    # The task runs every MAINPERIOD, so that is used as its time step
+    # rather than timing each run
+    dt = DT_S
+    # Forward bias, latched once the robot passes X = 25; X only grows
+    # along the course, so it is not checked again after that
+    bias = 0.0
+
+    # Methods called on every run, looked up once
+    get_lf_stop = lf_stop.get
+    get_velo_set = velo_set.get
+    view_X_pos = X_pos.view
+    put_offset = offset.put
+    read_line = Line_sensor.read
+    centroid = Line_sensor.centroid
 
     while True:
         if state == 0:
-            if lf_stop.get() == 1:
+            if get_lf_stop() == 1:
                 SENS_LED.value(0)
                 state = 1
                 yield state
 
-            if time_last == 0:
-                time_last = ticks_ms()
-
-            readings = Line_sensor.read()
-            Aixi_sum = 0
-            Ai_sum = 0
-
-            for idx, val in enumerate(readings):
-                Aixi_sum += val * (idx - length)
-                Ai_sum += val
-
-            if Aixi_sum == 0:
-                error = 0
-            else:
-                error = Aixi_sum / sum(readings)
+            read_line()
+            error = centroid(length)
 
             # P control
             p_ctrl = kp_lf * error
 
-            time_now = ticks_ms()
-            dt = ticks_diff(time_now, time_last) / 1000
-            time_last = time_now
-
-            # I control (with anti-windup when speed command is zero)
-            if int(velo_set.get()) == 0:
+            # I control (with anti-windup when speed command is zero). A
+            # command under 1 in/s either way counts as zero, as it did
+            # when this was tested with int()
+            if -1.0 < get_velo_set() < 1.0:
                 esum = 0
             else:
                 esum += error * dt
             i_ctrl = ki_lf * esum
 
-            ctrl_sig = p_ctrl + i_ctrl
-
             # Small bias after robot has moved a certain distance
-            if X_pos.view() > 25:
-                ctrl_sig += 8.5
+            if not bias and view_X_pos() > 25:
+                bias = 8.5
+
+            ctrl_sig = p_ctrl + i_ctrl + bias
 
-            offset.put(ctrl_sig)
+            put_offset(ctrl_sig)
             SENS_LED.value(1)
 
         elif state == 1:
@@ -440,6 +561,7 @@ def LineFollow_fun(shares):
         yield state
 
 
+@micropython.native
 def Pursuer_fun(shares):
     """Point seeking autonomous driving task.
 
@@ -493,16 +615,25 @@ def Pursuer_fun(shares):
     wall = False
     wall_hit = False
 
+    # Methods called on every run, looked up once
+    view_X = p_X.view
+    view_Y = p_Y.view
+    view_head = p_head.view
+    get_velo_set = velo_set.get
+    put_velo_set = velo_set.put
+    put_offset = offset.put
+    get_offset = thepursuer.get_offset
+
     while True:
         if state == 0:
             # When the robot passes a certain point, switch from line follower
-            if p_X.view() >= 31.25:
+            if view_X() >= 31.25:
                 lf_stop.put(1)
                 state = 1
 
         elif state == 1:
-            X = X_pos.view()
-            Y = Y_pos.view()
+            X = view_X()
+            Y = view_Y()
             if X < 3 and Y < 10 and not wall_hit:
                 if obst_sens.value() == 0:
                     wall = True
@@ -512,23 +643,19 @@ def Pursuer_fun(shares):
             else:
                 wall = False
 
-            off, speed = thepursuer.get_offset(
-                p_X.view(),
-                p_Y.view(),
-                p_head.view(),
-                wall,
-            )
+            off, speed = get_offset(X, Y, view_head(), wall)
 
-            if velo_set.get() != 0:
-                velo_set.put(speed)
-                offset.put(off)
+            if get_velo_set() != 0:
+                put_velo_set(speed)
+                put_offset(off)
             else:
-                velo_set.put(0)
-                offset.put(0)
+                put_velo_set(0)
+                put_offset(0)
 
         yield state
 
 
+@micropython.native
 def Controller_fun(shares):
     """Motor controller task (PI control for both wheels).
 
@@ -561,8 +688,10 @@ def Controller_fun(shares):
         :align: center
 
         Finite state machine for :func:`me405.main.Controller_fun`, showing the
-        initialization, active PI speed control, and stopped states used
-        to control the motors.
+        active PI speed control and stopped states used to control the
+        motors. The controllers are stepped with the fixed
+        ``DT_S`` time step, so there is nothing to initialize once running;
+        the task starts directly in state 1.
 
 
 
@@ -586,96 +715,120 @@ def Controller_fun(shares):
             * ``velo_set`` (:class:`task_share.Share`): Requested speed.
             * ``cmd_L``, ``cmd_R`` (:class:`task_share.Queue`):
               Commanded efforts written for logging/state space model.
+            * ``frame_ready`` (:class:`task_share.Share`): Telemetry bit
+              mask; ``FRAME_CTRL`` is set after each run.
     """
     (offset, leftencoder, leftmotor, pos_L, rightencoder, rightmotor, pos_R,
      t_L, v_L, t_R, v_R, r_ctrl, l_ctrl, velo_L, velo_R, time_L, time_R,
-     velo_set, cmd_L, cmd_R) = shares
+     velo_set, cmd_L, cmd_R, frame_ready) = shares
 
-    state = 0
+    # Start in closed-loop control. The PI time step is fixed, so the
+    # controllers' time references do not need to be seeded first
+    state = 1
     lastsig_L = 0.0
     lastsig_R = 0.0
-    delta = 0.0
+    # Fixed PI time step; the task runs every MAINPERIOD
+    dt = DT_S
+
+    # Latest [position, velocity] of each wheel, refilled every run
+    enc_L = array("f", [0.0, 0.0])
+    enc_R = array("f", [0.0, 0.0])
+
+    # Methods called on every run, looked up once
+    sample_L = leftencoder.sample
+    sample_R = rightencoder.sample
+    get_velo_set = velo_set.get
+    get_offset = offset.get
+    ctrl_sig_L = l_ctrl.get_ctrl_sig
+    ctrl_sig_R = r_ctrl.get_ctrl_sig
+    set_effort_L = leftmotor.set_effort
+    set_effort_R = rightmotor.set_effort
+    put_cmd_L = cmd_L.put
+    put_cmd_R = cmd_R.put
+    put_pos_L = pos_L.put_from
+    put_pos_R = pos_R.put_from
+    put_velo_L = velo_L.put_from
+    put_velo_R = velo_R.put_from
+    put_time_L = time_L.put
+    put_time_R = time_R.put
+    get_ready = frame_ready.get
+    put_ready = frame_ready.put
 
     while True:
         # Always update encoder readings
-        leftencoder.update()
-        t_L = time.ticks_ms()
-        rightencoder.update()
-        t_R = time.ticks_ms()
-        v_L = leftencoder.get_velocity()
-        v_R = rightencoder.get_velocity()
-
-        if state == 0:
-            # Initialize controller timing once data is available
-            l_ctrl.last_time = t_L
-            r_ctrl.last_time = t_R
-            state = 1
-
-        elif state == 1:
+        sample_L(enc_L)
+        sample_R(enc_R)
+        # One timestamp serves both wheels
+        t = ticks_ms()
+        v_L = enc_L[1]
+        v_R = enc_R[1]
+
+        if state == 1:
             # Normal closed-loop speed control
-            cmd = velo_set.get()
+            cmd = get_velo_set()
             if cmd == 0.0:
-                cmd_L.put(0)
-                leftmotor.set_effort(0)
-                cmd_R.put(0)
-                rightmotor.set_effort(0)
+                put_cmd_L(0)
+                set_effort_L(0)
+                put_cmd_R(0)
+                set_effort_R(0)
                 state = 2
             else:
-                off = offset.get()
+                off = get_offset()
 
                 # Left motor PI with slew-rate limiting
-                l_sig = l_ctrl.get_ctrl_sig((cmd + off), v_L, t_L)
-                delta = l_sig - lastsig_L
-                if delta > MAXDELTA:
-                    l_sig = lastsig_L + MAXDELTA
-                elif delta < -MAXDELTA:
-                    l_sig = lastsig_L - MAXDELTA
+                l_sig = ctrl_sig_L((cmd + off), v_L, t, dt)
+                l_sig = lastsig_L + min(MAXDELTA,
+                                        max(-MAXDELTA, l_sig - lastsig_L))
                 lastsig_L = l_sig
-                leftmotor.set_effort(l_sig)
-                cmd_L.put(l_sig)
+                set_effort_L(l_sig)
+                put_cmd_L(l_sig)
 
                 # Right motor PI with slew-rate limiting
-                r_sig = r_ctrl.get_ctrl_sig((cmd - off), v_R, t_R)
-                delta = r_sig - lastsig_R
-                if delta > MAXDELTA:
-                    r_sig = lastsig_R + MAXDELTA
-                elif delta < -MAXDELTA:
-                    r_sig = lastsig_R - MAXDELTA
+                r_sig = ctrl_sig_R((cmd - off), v_R, t, dt)
+                r_sig = lastsig_R + min(MAXDELTA,
+                                        max(-MAXDELTA, r_sig - lastsig_R))
                 lastsig_R = r_sig
-                rightmotor.set_effort(r_sig)
-                cmd_R.put(r_sig)
+                set_effort_R(r_sig)
+                put_cmd_R(r_sig)
 
         elif state == 2:
             # Stopped state: keep logging, wait for non-zero command
-            cmd = velo_set.get()
-            cmd_L.put(0)
-            cmd_R.put(0)
+            cmd = get_velo_set()
+            put_cmd_L(0)
+            put_cmd_R(0)
             if cmd != 0.0:
                 leftencoder.zero()
                 rightencoder.zero()
-                l_ctrl.reset(t_L)
-                r_ctrl.reset(t_R)
+                enc_L[0] = 0.0
+                enc_R[0] = 0.0
+                l_ctrl.reset(t)
+                r_ctrl.reset(t)
                 state = 1
 
         # Always log position, velocity, and time
-        pos_L.put(leftencoder.get_position())
-        velo_L.put(v_L)
-        time_L.put(t_L)
-        pos_R.put(rightencoder.get_position())
-        velo_R.put(v_R)
-        time_R.put(t_R)
+        put_pos_L(enc_L, 0)
+        put_velo_L(enc_L, 4)
+        put_time_L(t)
+        put_pos_R(enc_R, 0)
+        put_velo_R(enc_R, 4)
+        put_time_R(t)
+        put_ready(get_ready() | FRAME_CTRL)
 
         yield state
 
 
 def GarbageCollector_fun():
-    """Periodic garbage collection task.
+    """Safety-net garbage collection task.
 
-    This very low-priority task runs :func:`gc.collect` periodically to
-    help reduce memory fragmentation in the MicroPython heap.
+    Routine collections are triggered by the allocator itself through
+    :func:`gc.threshold`, which is set up just before the scheduler starts.
+    This very low-priority task only runs :func:`gc.collect` when free
+    memory has dropped below ``GC_LOW_WATER`` anyway, and it runs every
+    ``GC_PERIOD`` ms rather than every control period.
     """
     while True:
-        gc.collect()
+        if gc.mem_free() < GC_LOW_WATER:
+            gc.collect()
         yield
 
 
@@ -753,8 +906,6 @@ if __name__ == "__main__":
     rightencoder = Encoder(tim2, Pin.cpu.A15, Pin.cpu.B3)
     leftencoder = Encoder(tim1, Pin.cpu.A8, Pin.cpu.A9)
 
-    gc.collect()
-
     # Init controller objects
     r_ctrl = PIController(0.6, 15)
     l_ctrl = PIController(0.6, 15)
@@ -769,13 +920,12 @@ if __name__ == "__main__":
     serial_device = UART(5, 460800)
     btcomm = BTComm(serial_device)
 
-    packet_fmt = "<II" + "f" * 17
-    packet = bytearray(3 + ustruct.calcsize(packet_fmt))
-    packet[0] = 0xAA
-    packet[1] = 0x55
-    packet[2] = 0x00
-
-    gc.collect()
+    # Room for TX_BATCH packets back to back, each with its own header;
+    # Talker_fun fills in the fields
+    packet = bytearray(PACKET_LEN * TX_BATCH)
+    # The headers are written here once; Talker_fun never touches them
+    for base in range(0, len(packet), PACKET_LEN):
+        packet[base:base + 3] = b"\xAA\x55\x00"
 
     # LINE SENSOR SETUP
     s14 = Pin.cpu.C5
@@ -795,17 +945,13 @@ if __name__ == "__main__":
     evenctrl = Pin(Pin.cpu.H0, mode=Pin.OUT_PP, pull=Pin.PULL_DOWN, value=0)
     oddctrl = Pin(Pin.cpu.H1, mode=Pin.OUT_PP, pull=Pin.PULL_DOWN, value=0)
 
-    gc.collect()
     sensors = [s2, s3, s4, s5, s6, s7, s8, s9, s10, s11, s12, s13, s14]
     num_sens = len(sensors)
     Line_sensor = LineSensor(sensors, evenctrl, oddctrl)
     button = Pin(Pin.cpu.C13, Pin.IN, Pin.PULL_UP)
     SENS_LED = Pin(Pin.cpu.C6, Pin.OUT_PP, value=0)
 
-    Aixi_sum = 0
-    Ai_sum = 0
     length = (num_sens - 1) / 2
-    gc.collect()
 
     # IMU SETUP
     i2c = I2C(1, I2C.CONTROLLER)
@@ -818,19 +964,20 @@ if __name__ == "__main__":
     sleep(0.1)
 
     # State-space model setup
-    ssmodel = SSModel()
+    # Motor commands are duty cycles in percent; at the ~9 V supply each
+    # percent is 0.09 V
+    ssmodel = SSModel(u_scale=0.09)
     u = array("f", [0.0, 0.0])
     y = array("f", [0.0, 0.0, 0.0, 0.0, 0.0])
-    mainperiod = 30  # ms
+    mainperiod = MAINPERIOD  # ms
 
-    # Pure pursuit setup (assumes BASESPEED, kp_head, ki_head are defined elsewhere)
-    thepursuer = ThePursuer(BASESPEED, ARRIVED, kp_head, ki_head)
+    # Pure pursuit setup
+    thepursuer = ThePursuer(BASESPEED, ARRIVED, KP_HEAD, KI_HEAD)
 
     # Obstacle sensor and LEDs
     obst_sens = Pin(Pin.cpu.B7, Pin.IN, pull=Pin.PULL_DOWN)
     RUN_LED = Pin(Pin.cpu.C10, Pin.OUT_PP, value=0)
     WALL_LED = Pin(Pin.cpu.C11, Pin.OUT_PP, value=0)
-    gc.collect()
 
     # SHARES
     velo_set = task_share.Share("f", thread_protect=False, name="Motor Speed Set Point")
@@ -841,7 +988,7 @@ if __name__ == "__main__":
         name="Motor setpoint adjustment from line follower",
     )
     lf_stop = task_share.Share("I", thread_protect=False, name="Line follow stop flag")
-    gc.collect()
+    frame_ready = task_share.Share("I", thread_protect=False, name="Telemetry frame ready bits")
 
     # QUEUES
     cmd_L = task_share.Queue(
@@ -875,14 +1022,6 @@ if __name__ == "__main__":
         overwrite=True,
         name="Euler heading (in radians) from the IMU",
     )
-    yaw_rate = task_share.Queue(
-        "f",
-        20,
-        thread_protect=False,
-        overwrite=True,
-        name="Yaw rate (in radians/s) from the IMU",
-    )
-    gc.collect()
 
     X_pos = task_share.Queue(
         "f", 10, thread_protect=False, overwrite=True, name="Absolute X Position"
@@ -916,7 +1055,6 @@ if __name__ == "__main__":
         overwrite=True,
         name="Path Length - Right Wheel",
     )
-    gc.collect()
 
     # Default values
     velo_set.put(0.0)
@@ -927,6 +1065,7 @@ if __name__ == "__main__":
     kp_lf = 1.1
     ki_lf = 0
     lf_stop.put(0)
+    frame_ready.put(0)
 
     # TASK CREATION
     Controller = cotask.Task(
@@ -957,6 +1096,7 @@ if __name__ == "__main__":
             velo_set,
             cmd_L,
             cmd_R,
+            frame_ready,
         ),
     )
     IMU_Interface = cotask.Task(
@@ -966,18 +1106,17 @@ if __name__ == "__main__":
         period=mainperiod,
         profile=True,
         trace=False,
-        shares=(imu, Eul_head, yaw_rate, SENS_LED),
+        shares=(imu, Eul_head, SENS_LED, frame_ready),
     )
     Talker = cotask.Task(
         Talker_fun,
         name="Talker",
         priority=1,
-        period=10,
+        period=20,
         profile=True,
         trace=False,
         shares=(
             packet,
-            packet_fmt,
             btcomm,
             velo_set,
             kp_lf,
@@ -992,7 +1131,6 @@ if __name__ == "__main__":
             cmd_R,
             offset,
             Eul_head,
-            yaw_rate,
             X_pos,
             Y_pos,
             p_v_R,
@@ -1001,6 +1139,7 @@ if __name__ == "__main__":
             p_yaw,
             p_pos_L,
             p_pos_R,
+            frame_ready,
         ),
     )
     Pursuer = cotask.Task(
@@ -1020,8 +1159,8 @@ if __name__ == "__main__":
         period=mainperiod,
         profile=True,
         trace=False,
-        shares=(SENS_LED, length, Aixi_sum, Ai_sum, X_pos, velo_set, lf_stop,
-                kp_lf, ki_lf, offset, Line_sensor),
+        shares=(SENS_LED, length, X_pos, velo_set, lf_stop, kp_lf, ki_lf,
+                offset, Line_sensor),
     )
     SS_Simulator = cotask.Task(
         SS_Simulator_fun,
@@ -1052,45 +1191,64 @@ if __name__ == "__main__":
             p_yaw,
             p_pos_L,
             p_pos_R,
+            frame_ready,
         ),
     )
     GarbageCollector = cotask.Task(
         GarbageCollector_fun,
         name="Garbage Collect",
         priority=0,
-        period=mainperiod,
+        period=GC_PERIOD,
         profile=True,
         trace=False,
     )
-    gc.collect()
 
-    cotask.task_list.append(Controller)
-    cotask.task_list.append(IMU_Interface)
-    cotask.task_list.append(Talker)
-    cotask.task_list.append(SS_Simulator)
-    cotask.task_list.append(Pursuer)
-    cotask.task_list.append(LineFollow)
-    cotask.task_list.append(GarbageCollector)
+    cotask.task_list.extend((Controller, IMU_Interface, Talker, SS_Simulator,
+                             Pursuer, LineFollow, GarbageCollector))
+
+    # One collection once everything is built; nothing allocated during
+    # setup is garbage until then
     gc.collect()
 
     print("All tasks initialized.")
-    print(gc.mem_alloc())
-    print(gc.mem_free())
+    # Statistics can be turned on without editing this file by copying a
+    # file called "memstats" to the board
+    memstats = MEMSTATS
+    try:
+        open("memstats").close()
+        memstats = True
+    except OSError:
+        pass
 
-    gc.collect()
+    # mem_alloc() and mem_free() each walk the whole heap, so the heap usage
+    # is only printed when asked for. Apart from sizing gc.threshold() below,
+    # the only other mem_free() call is in the GC task, once every GC_PERIOD
+    if memstats:
+        print(gc.mem_alloc())
+        print(gc.mem_free())
+        # Queue high-water marks are shown by show_all() once stopped; they
+        # read -1 when not tracked
+        for item in task_share.share_list:
+            if isinstance(item, task_share.Queue):
+                item.enable_maxfull_tracking()
+
+    # Collect automatically after each quarter of the free heap is allocated
+    gc.threshold(gc.mem_free() // 4)
 
     imu.init_heading()
 
-    while True:
-        try:
-            cotask.task_list.pri_sched()
-        except KeyboardInterrupt:
-            leftmotor.set_effort(0)
-            rightmotor.set_effort(0)
-            imu.set_config()
-            sleep(0.1)
-            imu.read_cal_data("calibration.txt")
-            break
+    # pri_sched() runs one task per call; the exception handler is set up
+    # once around the whole loop rather than on every pass
+    pri_sched = cotask.task_list.pri_sched
+    try:
+        while True:
+            pri_sched()
+    except KeyboardInterrupt:
+        leftmotor.set_effort(0)
+        rightmotor.set_effort(0)
+        imu.set_config()
+        sleep(0.1)
+        imu.read_cal_data("calibration.txt")
 
     print("\n" + str(cotask.task_list))
     print(task_share.show_all())
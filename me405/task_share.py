@@ -19,8 +19,7 @@ full GPLv3 license text for details.
 """
 
 import array
-import gc
-import pyb
+from pyb import disable_irq, enable_irq
 import micropython
 
 
@@ -44,6 +43,17 @@ type_code_strings = {
     "d": "double",
 }
 
+#: Type codes wider than one machine word; reading or writing one of these
+#: takes more than one store, so it can be torn by an interrupt.
+_multi_word_codes = "qQd"
+
+
+@micropython.viper
+def _copy_bytes(dst: ptr8, dst_off: int, src: ptr8, src_off: int, n: int):
+    """Copy ``n`` raw bytes from ``src[src_off:]`` to ``dst[dst_off:]``."""
+    for i in range(n):
+        dst[dst_off + i] = src[src_off + i]
+
 
 def show_all() -> str:
     """Return a diagnostic string describing all queues and shares.
@@ -63,6 +73,9 @@ class BaseShare:
     type code and registering the object in :data:`share_list`.
     """
 
+    # Fixed attribute layout; no per-instance dictionary is needed
+    __slots__ = ("_type_code", "_tc_str", "_thread_protect", "_item_size")
+
     def __init__(self, type_code: str, thread_protect: bool = True, name=None):
         """Initialize data shared between queues and shares.
 
@@ -73,7 +86,11 @@ class BaseShare:
             name: Optional human-readable name for diagnostics.
         """
         self._type_code = type_code
+        # Readable type name for diagnostics, looked up once
+        self._tc_str = type_code_strings[type_code]
         self._thread_protect = thread_protect
+        # Size in bytes of one item, used when copying items out raw
+        self._item_size = len(bytearray(array.array(type_code, [0])))
 
         # Add this instance to the global diagnostics list
         share_list.append(self)
@@ -110,6 +127,11 @@ class Queue(BaseShare):
                     yield 0
     """
 
+    __slots__ = (
+        "_size", "_mask", "_overwrite", "_name", "_buffer", "_rd_idx",
+        "_wr_idx", "_num_items", "_max_full",
+    )
+
     #: Counter used to give serial numbers to queues for diagnostics.
     ser_num = 0
 
@@ -126,7 +148,9 @@ class Queue(BaseShare):
         Args:
             type_code: One-letter :mod:`array` type code for queue contents
                 (for example ``"h"`` for signed 16-bit integers).
-            size: Maximum number of items the queue can hold.
+            size: Maximum number of items the queue can hold. It is
+                rounded up to a power of two, so the read and write
+                positions can wrap around with a bit mask.
             thread_protect: If ``True``, disable/restore interrupts during
                 put/get operations to avoid data corruption.
             overwrite: If ``True``, allow new data to overwrite old data when
@@ -137,24 +161,31 @@ class Queue(BaseShare):
         """
         super().__init__(type_code, thread_protect, name)
 
+        # Round the capacity up to a power of two for mask-based wrapping
+        cap = 1
+        while cap < size:
+            cap <<= 1
+        size = cap
         self._size = size
+        self._mask = size - 1
         self._overwrite = overwrite
         self._name = str(name) if name is not None else f"Queue{Queue.ser_num}"
         Queue.ser_num += 1
 
-        # Allocate storage for the queue
+        # Allocate zero-filled storage for the queue straight from a block
+        # of bytes, rather than converting a range of ints one at a time
         try:
-            self._buffer = array.array(type_code, range(size))
+            self._buffer = array.array(type_code, bytes(self._item_size * size))
         except (MemoryError, ValueError):
             self._buffer = None
             raise
 
+        # High-water mark is only tracked on request; -1 means it is off
+        self._max_full = -1
+
         # Initialize pointers and counters
         self.clear()
 
-        # Tidy up memory after allocation
-        gc.collect()
-
     @micropython.native
     def put(self, item, in_ISR: bool = False):
         """Put an item into the queue.
@@ -177,20 +208,57 @@ class Queue(BaseShare):
                     pass
 
         if self._thread_protect and not in_ISR:
-            _irq_state = pyb.disable_irq()
+            _irq_state = disable_irq()
 
         self._buffer[self._wr_idx] = item
-        self._wr_idx += 1
-        if self._wr_idx >= self._size:
-            self._wr_idx = 0
+        self._wr_idx = (self._wr_idx + 1) & self._mask
+        self._num_items += 1
+        if self._num_items >= self._size:
+            self._num_items = self._size
+        # A negative high-water mark means it isn't being tracked
+        if self._max_full >= 0 and self._num_items > self._max_full:
+            self._max_full = self._num_items
+
+        if self._thread_protect and not in_ISR:
+            enable_irq(_irq_state)
+
+    @micropython.native
+    def put_from(self, buf, offset: int, in_ISR: bool = False):
+        """Put an item into the queue by copying its raw bytes from a buffer.
+
+        The counterpart of :meth:`get_into`: it behaves like :meth:`put`,
+        but the item is copied straight from ``buf``, such as an
+        :mod:`array` of the same type as the queue, so no Python object is
+        created for it.
+
+        Args:
+            buf: Buffer holding the item in the processor's native format.
+            offset: Byte position of the item in ``buf``.
+            in_ISR: Set to ``True`` if called from an interrupt handler.
+        """
+        if self.full():
+            if in_ISR:
+                return
+
+            if not self._overwrite:
+                while self.full():
+                    pass
+
+        if self._thread_protect and not in_ISR:
+            _irq_state = disable_irq()
+
+        size = self._item_size
+        _copy_bytes(self._buffer, self._wr_idx * size, buf, offset, size)
+        self._wr_idx = (self._wr_idx + 1) & self._mask
         self._num_items += 1
         if self._num_items >= self._size:
             self._num_items = self._size
-        if self._num_items > self._max_full:
+        # A negative high-water mark means it isn't being tracked
+        if self._max_full >= 0 and self._num_items > self._max_full:
             self._max_full = self._num_items
 
         if self._thread_protect and not in_ISR:
-            pyb.enable_irq(_irq_state)
+            enable_irq(_irq_state)
 
     @micropython.native
     def get(self, in_ISR: bool = False):
@@ -212,22 +280,55 @@ class Queue(BaseShare):
             raise ValueError("You tried to get from an empty queue")
 
         if self._thread_protect and not in_ISR:
-            irq_state = pyb.disable_irq()
+            irq_state = disable_irq()
 
         to_return = self._buffer[self._rd_idx]
 
-        self._rd_idx += 1
-        if self._rd_idx >= self._size:
-            self._rd_idx = 0
+        self._rd_idx = (self._rd_idx + 1) & self._mask
         self._num_items -= 1
         if self._num_items < 0:
             self._num_items = 0
 
         if self._thread_protect and not in_ISR:
-            pyb.enable_irq(irq_state)
+            enable_irq(irq_state)
 
         return to_return
 
+    @micropython.native
+    def get_into(self, buf, offset: int, in_ISR: bool = False):
+        """Remove the oldest item and copy its raw bytes into a buffer.
+
+        This does the same job as :meth:`get` followed by packing the value
+        into ``buf``, but the bytes are copied straight from the queue's
+        storage, so no Python object is created for the item. The bytes are
+        in the processor's native (little-endian) format.
+
+        Args:
+            buf: Writable buffer such as a :class:`bytearray`.
+            offset: Byte position in ``buf`` where the item is written.
+            in_ISR: Set to ``True`` if called from an interrupt handler.
+
+        Raises:
+            ValueError: If the queue is empty when called.
+        """
+        if self.empty():
+            raise ValueError("You tried to get from an empty queue")
+
+        if self._thread_protect and not in_ISR:
+            irq_state = disable_irq()
+
+        size = self._item_size
+        _copy_bytes(buf, offset, self._buffer, self._rd_idx * size, size)
+
+        self._rd_idx = (self._rd_idx + 1) & self._mask
+        self._num_items -= 1
+        if self._num_items < 0:
+            self._num_items = 0
+
+        if self._thread_protect and not in_ISR:
+            enable_irq(irq_state)
+
+    @micropython.native
     def view(self, in_ISR: bool = False):
         """Return the most recently written item without removing it.
 
@@ -247,15 +348,45 @@ class Queue(BaseShare):
             raise ValueError("You tried to view an empty queue")
 
         if self._thread_protect and not in_ISR:
-            irq_state = pyb.disable_irq()
+            irq_state = disable_irq()
 
-        item = self._buffer[self._wr_idx - 1]
+        item = self._buffer[(self._wr_idx - 1) & self._mask]
 
         if self._thread_protect and not in_ISR:
-            pyb.enable_irq(irq_state)
+            enable_irq(irq_state)
 
         return item
 
+    @micropython.native
+    def view_into(self, buf, offset: int, in_ISR: bool = False):
+        """Copy the raw bytes of the newest item into a buffer.
+
+        Like :meth:`view`, the item is left in the queue. Like
+        :meth:`get_into`, its bytes are copied straight from the queue's
+        storage, so no Python object is created for it.
+
+        Args:
+            buf: Writable buffer such as a :class:`bytearray` or an
+                :class:`array.array` of the same type code.
+            offset: Byte position in ``buf`` where the item is written.
+            in_ISR: Set to ``True`` if called from an interrupt handler.
+
+        Raises:
+            ValueError: If the queue is empty.
+        """
+        if self.empty():
+            raise ValueError("You tried to view an empty queue")
+
+        if self._thread_protect and not in_ISR:
+            irq_state = disable_irq()
+
+        size = self._item_size
+        idx = (self._wr_idx - 1) & self._mask
+        _copy_bytes(buf, offset, self._buffer, idx * size, size)
+
+        if self._thread_protect and not in_ISR:
+            enable_irq(irq_state)
+
     @micropython.native
     def any(self) -> bool:
         """Return ``True`` if there is at least one item in the queue."""
@@ -286,13 +417,29 @@ class Queue(BaseShare):
         self._rd_idx = 0
         self._wr_idx = 0
         self._num_items = 0
-        self._max_full = 0
+        if self._max_full > 0:
+            self._max_full = 0
+
+    def enable_maxfull_tracking(self, enable: bool = True):
+        """Turn tracking of the queue's high-water mark on or off.
+
+        Tracking costs a compare on every put, so it is off by default and
+        meant for debugging runs. While it is off, :meth:`__repr__` shows
+        ``-1`` as the maximum number of items the queue has held.
+
+        Args:
+            enable: ``True`` to start tracking from zero, ``False`` to stop.
+        """
+        if not enable:
+            self._max_full = -1
+        elif self._max_full < 0:
+            self._max_full = 0
 
     def __repr__(self) -> str:
         """Return a concise diagnostic representation of this queue."""
         return "{:<12s} Queue<{:s}> Max Full {:d}/{:d}".format(
             self._name,
-            type_code_strings[self._type_code],
+            self._tc_str,
             self._max_full,
             self._size,
         )
@@ -320,6 +467,9 @@ class Share(BaseShare):
             value = my_share.get()
     """
 
+    # No __slots__: one-word shares rebind put and get per instance, which
+    # needs an instance dictionary
+
     #: Counter used to give serial numbers to shares for diagnostics.
     ser_num = 0
 
@@ -340,6 +490,23 @@ class Share(BaseShare):
         self._name = str(name) if name is not None else f"Share{Share.ser_num}"
         Share.ser_num += 1
 
+        # A value that fits in one machine word is written and read with a
+        # single store or load, which an interrupt can't split, so those
+        # shares skip the interrupt disable/enable checks entirely
+        if type_code not in _multi_word_codes:
+            self.put = self._put_word
+            self.get = self._get_word
+
+    @micropython.native
+    def _put_word(self, data, in_ISR: bool = False):
+        """Write a one-word value; used as :meth:`put` where it applies."""
+        self._buffer[0] = data
+
+    @micropython.native
+    def _get_word(self, in_ISR: bool = False):
+        """Read a one-word value; used as :meth:`get` where it applies."""
+        return self._buffer[0]
+
     @micropython.native
     def put(self, data, in_ISR: bool = False):
         """Write an item of data into the share.
@@ -349,12 +516,12 @@ class Share(BaseShare):
             in_ISR: Set to ``True`` if called from an interrupt handler.
         """
         if self._thread_protect and not in_ISR:
-            irq_state = pyb.disable_irq()
+            irq_state = disable_irq()
 
         self._buffer[0] = data
 
         if self._thread_protect and not in_ISR:
-            pyb.enable_irq(irq_state)
+            enable_irq(irq_state)
 
     @micropython.native
     def get(self, in_ISR: bool = False):
@@ -367,17 +534,38 @@ class Share(BaseShare):
             The current value stored in the share.
         """
         if self._thread_protect and not in_ISR:
-            irq_state = pyb.disable_irq()
+            irq_state = disable_irq()
 
         to_return = self._buffer[0]
 
         if self._thread_protect and not in_ISR:
-            pyb.enable_irq(irq_state)
+            enable_irq(irq_state)
 
         return to_return
 
+    @micropython.native
+    def get_into(self, buf, offset: int, in_ISR: bool = False):
+        """Copy the raw bytes of the current value into a buffer.
+
+        The counterpart of :meth:`Queue.get_into` for shares; the value is
+        written in the processor's native (little-endian) format without
+        creating a Python object for it.
+
+        Args:
+            buf: Writable buffer such as a :class:`bytearray`.
+            offset: Byte position in ``buf`` where the value is written.
+            in_ISR: Set to ``True`` if called from an interrupt handler.
+        """
+        if self._thread_protect and not in_ISR:
+            irq_state = disable_irq()
+
+        _copy_bytes(buf, offset, self._buffer, 0, self._item_size)
+
+        if self._thread_protect and not in_ISR:
+            enable_irq(irq_state)
+
     def __repr__(self) -> str:
         """Return a concise diagnostic representation of this share."""
         return "{:<12s} Share<{:s}>".format(
-            self._name, type_code_strings[self._type_code]
+            self._name, self._tc_str
         )